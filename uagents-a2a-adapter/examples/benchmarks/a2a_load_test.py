@@ -0,0 +1,298 @@
+"""
+End-to-end load test: A2A clients -> A2A server -> bridge uAgents -> a local stand-in uAgent.
+
+Everything runs on this machine. The A2A server is the app ``main.py`` serves
+(``create_app``), with its bridge pool in integrated mode. No Agentverse,
+mailbox or LLM is involved: the bridge and the stand-in agent run without a
+mailbox and reach each other through their local HTTP endpoints, which are
+passed to uAgents as resolver rules. The stand-in echoes each query after
+``--delay`` seconds, optionally split over ``--chunks`` streamed messages.
+
+``--concurrency`` clients drive ``A2AClient.send_message`` and/or
+``send_message_streaming``. The script reports throughput, latency
+percentiles (and time to first event when streaming), failures, process
+memory before and after each run, and the server's pending-request gauge
+afterwards, which should be back at zero.
+
+Usage:
+    python examples/benchmarks/a2a_load_test.py --requests 500 --concurrency 50
+    python examples/benchmarks/a2a_load_test.py --mode stream --delay 0.05 --chunks 3
+"""
+
+import argparse
+import asyncio
+import re
+import resource
+import threading
+import time
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import httpx
+import uvicorn
+from a2a.client import A2AClient
+from a2a.types import (
+    JSONRPCErrorResponse,
+    MessageSendParams,
+    SendMessageRequest,
+    SendStreamingMessageRequest,
+    TaskState,
+)
+from uagents import Agent, Context, Protocol
+from uagents.crypto import Identity
+from uagents.resolver import RulesBasedResolver
+from uagents_core.contrib.protocols.chat import (
+    ChatAcknowledgement,
+    ChatMessage,
+    MetadataContent,
+    TextContent,
+    chat_protocol_spec,
+)
+
+from uagents_a2a_adapter.main import create_app, create_bridge_pool, create_task_store
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def rss_mb():
+    """Current resident set size in MB (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * resource.getpagesize() / 2 ** 20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def local_endpoint(port):
+    return f"http://127.0.0.1:{port}/submit"
+
+
+def build_standin(port, bridge_endpoints, delay, chunks):
+    """Stand-in target: echoes the query after ``delay``, in ``chunks`` messages."""
+    agent = Agent(
+        name="load_test_standin",
+        port=port,
+        seed="load_test_standin_seed",
+        resolve=RulesBasedResolver(bridge_endpoints),
+        # Built inside the server thread, which has no default loop
+        loop=asyncio.get_running_loop(),
+    )
+    proto = Protocol(spec=chat_protocol_spec)
+    replies = set()
+
+    def chat_reply(text, metadata):
+        return ChatMessage(
+            timestamp=datetime.now(timezone.utc),
+            msg_id=uuid4(),
+            content=[
+                TextContent(type="text", text=text),
+                MetadataContent(type="metadata", metadata=metadata),
+            ],
+        )
+
+    async def reply(ctx, sender, msg):
+        text = ""
+        metadata = {'in_reply_to': str(msg.msg_id)}
+        for content in msg.content:
+            if isinstance(content, TextContent):
+                text += content.text
+            elif isinstance(content, MetadataContent) and 'context_id' in content.metadata:
+                metadata['context_id'] = content.metadata['context_id']
+        await asyncio.sleep(delay)
+        for seq in range(chunks - 1):
+            await ctx.send(sender, chat_reply(f"part {seq}: ", dict(metadata, seq=str(seq), final='false')))
+        await ctx.send(sender, chat_reply(f"echo: {text}", dict(metadata, final='true', status='completed')))
+
+    @proto.on_message(ChatMessage)
+    async def handle_chat(ctx: Context, sender: str, msg: ChatMessage):
+        await ctx.send(sender, ChatAcknowledgement(
+            timestamp=datetime.now(timezone.utc), acknowledged_msg_id=msg.msg_id,
+        ))
+        # Reply in the background so requests are served concurrently
+        task = asyncio.create_task(reply(ctx, sender, msg))
+        replies.add(task)
+        task.add_done_callback(replies.discard)
+
+    @proto.on_message(ChatAcknowledgement)
+    async def handle_ack(ctx: Context, sender: str, msg: ChatAcknowledgement):
+        pass
+
+    agent.include(proto)
+    return agent
+
+
+class ServerThread:
+    """Runs the stand-in agent and the A2A server on their own loop and thread."""
+
+    def __init__(self, args):
+        self.args = args
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_until_complete, args=(self._serve(),), daemon=True)
+        self.server = None
+
+    async def _serve(self):
+        args = self.args
+        bridge_names = ["load_test_bridge" if i == 0 else f"load_test_bridge_{i}" for i in range(args.bridge_workers)]
+        bridge_endpoints = {
+            Identity.from_seed(f"{name}_seed", 0).address: local_endpoint(args.bridge_port + i)
+            for i, name in enumerate(bridge_names)
+        }
+        standin = build_standin(args.agent_port, bridge_endpoints, args.delay, args.chunks)
+        standin_task = asyncio.create_task(standin.run_async())
+
+        bridge_pool = create_bridge_pool(
+            "load_test_bridge", args.bridge_port, args.bridge_workers, 'integrated',
+            agent_options={
+                'mailbox': False,
+                'resolve': RulesBasedResolver({standin.address: local_endpoint(args.agent_port)}),
+            },
+        )
+        app = create_app(standin.address, "127.0.0.1", args.port, bridge_pool, agent_name="Load Test Agent",
+                         task_store=create_task_store('memory'))
+        config = uvicorn.Config(app, host="127.0.0.1", port=args.port, log_level="warning")
+        self.server = uvicorn.Server(config)
+        try:
+            await self.server.serve()
+        finally:
+            standin_task.cancel()
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self.server is not None:
+            self.server.should_exit = True
+        self.thread.join(timeout=10)
+
+
+async def wait_until_ready(base_url, timeout):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(f"{base_url}/.well-known/agent.json")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.1)
+    raise RuntimeError(f"A2A server at {base_url} did not come up within {timeout}s")
+
+
+def message_params(index):
+    return MessageSendParams(message={
+        'role': 'user',
+        'parts': [{'kind': 'text', 'text': f"load test query {index}"}],
+        'messageId': uuid4().hex,
+    })
+
+
+async def send_once(client, index):
+    started = time.perf_counter()
+    response = await client.send_message(SendMessageRequest(id=str(uuid4()), params=message_params(index)))
+    elapsed = time.perf_counter() - started
+    if isinstance(response.root, JSONRPCErrorResponse):
+        return elapsed, None, False
+    result = response.root.result
+    ok = getattr(getattr(result, 'status', None), 'state', None) == TaskState.completed
+    return elapsed, None, ok
+
+
+async def stream_once(client, index):
+    started = time.perf_counter()
+    first_event = None
+    ok = False
+    request = SendStreamingMessageRequest(id=str(uuid4()), params=message_params(index))
+    async for chunk in client.send_message_streaming(request):
+        if first_event is None:
+            first_event = time.perf_counter() - started
+        if isinstance(chunk.root, JSONRPCErrorResponse):
+            return time.perf_counter() - started, first_event, False
+        status = getattr(chunk.root.result, 'status', None)
+        if status is not None and status.state == TaskState.completed:
+            ok = True
+    return time.perf_counter() - started, first_event, ok
+
+
+async def run_load(base_url, mode, requests, concurrency, warmup):
+    call = send_once if mode == "send" else stream_once
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(timeout=300.0, limits=limits) as httpx_client:
+        client = A2AClient(httpx_client=httpx_client, url=f"{base_url}/")
+        for index in range(warmup):
+            await call(client, -index - 1)
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def limited(index):
+            async with semaphore:
+                try:
+                    return await call(client, index)
+                except Exception:
+                    return None, None, False
+
+        rss_before = rss_mb()
+        started = time.perf_counter()
+        results = await asyncio.gather(*(limited(index) for index in range(requests)))
+        wall = time.perf_counter() - started
+        rss_after = rss_mb()
+    return results, wall, rss_before, rss_after
+
+
+def report(mode, results, wall, rss_before, rss_after):
+    latencies = [elapsed for elapsed, _, ok in results if ok]
+    first_events = [first for _, first, ok in results if ok and first is not None]
+    failures = len(results) - len(latencies)
+    print(f"\n{mode}: {len(results)} requests in {wall:.2f}s "
+          f"({len(latencies) / wall:.1f} req/s), {failures} failed")
+    if latencies:
+        print(f"  latency ms      p50 {percentile(latencies, 50) * 1000:8.1f}  "
+              f"p90 {percentile(latencies, 90) * 1000:8.1f}  p99 {percentile(latencies, 99) * 1000:8.1f}  "
+              f"max {max(latencies) * 1000:8.1f}")
+    if first_events:
+        print(f"  first event ms  p50 {percentile(first_events, 50) * 1000:8.1f}  "
+              f"p90 {percentile(first_events, 90) * 1000:8.1f}  p99 {percentile(first_events, 99) * 1000:8.1f}")
+    print(f"  RSS MB          {rss_before:.1f} -> {rss_after:.1f} ({rss_after - rss_before:+.1f})")
+
+
+async def pending_after(base_url):
+    async with httpx.AsyncClient() as client:
+        text = (await client.get(f"{base_url}/metrics")).text
+    match = re.search(r"^a2a_bridge_pending_requests (\S+)$", text, re.MULTILINE)
+    return float(match.group(1)) if match else None
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=5, help="Sequential requests before measuring")
+    parser.add_argument("--mode", choices=["send", "stream", "both"], default="both")
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds the stand-in agent waits before replying")
+    parser.add_argument("--chunks", type=int, default=1, help="Messages the stand-in sends per reply")
+    parser.add_argument("--bridge-workers", type=int, default=1)
+    parser.add_argument("--port", type=int, default=10100, help="A2A server port")
+    parser.add_argument("--bridge-port", type=int, default=8190)
+    parser.add_argument("--agent-port", type=int, default=8180, help="Stand-in uAgent port")
+    parser.add_argument("--startup-timeout", type=float, default=30.0)
+    args = parser.parse_args()
+    args.chunks = max(1, args.chunks)
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    modes = ["send", "stream"] if args.mode == "both" else [args.mode]
+    print(f"{args.requests} requests per mode, concurrency {args.concurrency}, "
+          f"stand-in delay {args.delay * 1000:.0f}ms in {args.chunks} message(s), "
+          f"{args.bridge_workers} bridge worker(s)")
+
+    with ServerThread(args):
+        await wait_until_ready(base_url, args.startup_timeout)
+        for mode in modes:
+            report(mode, *await run_load(base_url, mode, args.requests, args.concurrency, args.warmup))
+        print(f"\npending requests after the run: {await pending_after(base_url)}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,92 @@
+"""
+Concurrency stress test for bridge reply correlation.
+
+Registers hundreds of concurrent requests in a ``PendingRequestStore``, all
+addressed to the same target agent, and has a simulated target answer them
+from another thread in random order. Each waiter checks that it received the
+answer to its own query.
+
+Modes:
+- msg_id:  the target echoes the outgoing msg_id as ``in_reply_to``
+- context: the target only echoes the A2A context id
+- sender:  the target echoes nothing (legacy fallback, expected to cross)
+
+Usage:
+    python examples/benchmarks/correlation_stress.py --requests 500
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import threading
+import time
+from uuid import uuid4
+
+from uagents_a2a_adapter.pending_requests import PendingRequestStore
+
+TARGET = "agent1qtarget"
+
+
+def reply_in_random_order(store, sent, mode, seed):
+    """Answer every sent request from a separate thread, shuffled."""
+    rng = random.Random(seed)
+    rng.shuffle(sent)
+    for msg_id, context_id, query in sent:
+        time.sleep(rng.uniform(0, 0.0005))
+        request_id = store.match(
+            TARGET,
+            in_reply_to=msg_id if mode == "msg_id" else None,
+            context_id=context_id if mode == "context" else None,
+        )
+        if request_id is not None:
+            store.resolve(request_id, f"answer to {query}")
+
+
+async def run(mode, requests, seed):
+    store = PendingRequestStore()
+    sent = []
+
+    async def request(i):
+        query = f"query {i}"
+        request_id, replies = store.add(query, context_id=f"ctx_{i}")
+        msg_id = str(uuid4())
+        store.mark_sent(request_id, msg_id, TARGET)
+        sent.append((msg_id, f"ctx_{i}", query))
+        reply = await asyncio.wait_for(replies.get(), timeout=30)
+        return reply['parts'] == [f"answer to {query}"]
+
+    tasks = [asyncio.ensure_future(request(i)) for i in range(requests)]
+    # Let every request register before the target starts answering
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    replier = threading.Thread(target=reply_in_random_order, args=(store, sent, mode, seed))
+    replier.start()
+    results = await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+    replier.join()
+    return results.count(False), elapsed, len(store)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=500, help="Number of concurrent requests")
+    parser.add_argument("--mode", choices=["msg_id", "context", "sender", "all"], default="all")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    modes = ["msg_id", "context", "sender"] if args.mode == "all" else [args.mode]
+    failed = False
+    for mode in modes:
+        crossed, elapsed, leftover = asyncio.run(run(mode, args.requests, args.seed))
+        print(
+            f"{mode:<8} requests={args.requests} crossed={crossed} "
+            f"leftover={leftover} elapsed={elapsed * 1000:.1f}ms"
+        )
+        if mode != "sender" and (crossed or leftover):
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Concurrency benchmark for the currency example's ``CurrencyAgent.stream``.
+
+Runs N conversations at once on a single event loop with a stubbed chat
+model and a stubbed Frankfurter API, both answering after a fixed delay.
+Each conversation makes one tool call, so it spends two model turns and one
+structured-output turn waiting; the rate itself is fetched once and then
+served from the agent's rate cache (pass ``--no-rate-cache`` to fetch it in
+every conversation). If ``stream`` blocked the loop, the conversations
+would run one after another; with ``astream`` and the async HTTP client
+they overlap and the wall time stays close to that of a single conversation.
+
+With ``--turns`` above 1 each conversation asks several questions on one
+thread, and the script checks that every question reached the model even
+after the history window (``--history-messages``) starts trimming.
+
+No API keys or network access are needed.
+
+Usage:
+    python examples/benchmarks/currency_agent_concurrency.py --conversations 50
+    python examples/benchmarks/currency_agent_concurrency.py --turns 4 --history-messages 5
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from uuid import uuid4
+
+import httpx
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.runnables import RunnableLambda
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "currency-exchange-agent"))
+
+import agent as currency_agent  # noqa: E402
+
+# Latest user question in each prompt the stub model received
+prompted_questions = set()
+
+
+class StubChatModel(BaseChatModel):
+    """Calls ``get_exchange_rate`` once, then answers; every turn takes ``delay`` seconds."""
+
+    delay: float = 0.2
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub"
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def with_structured_output(self, schema, **kwargs):
+        async def respond(_):
+            await asyncio.sleep(self.delay)
+            return schema(status="completed", message="1 USD = 0.9 EUR")
+
+        return RunnableLambda(lambda _: schema(status="completed", message="1 USD = 0.9 EUR"), afunc=respond)
+
+    def _reply(self, messages):
+        question = next((m for m in reversed(messages) if isinstance(m, HumanMessage)), None)
+        if question is not None:
+            prompted_questions.add(question.content)
+        if isinstance(messages[-1], ToolMessage):
+            return AIMessage(content="1 USD = 0.9 EUR")
+        return AIMessage(
+            content="",
+            tool_calls=[{
+                "name": "get_exchange_rate",
+                "args": {"currency_from": "USD", "currency_to": "EUR"},
+                "id": uuid4().hex,
+            }],
+        )
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        time.sleep(self.delay)
+        return ChatResult(generations=[ChatGeneration(message=self._reply(messages))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        await asyncio.sleep(self.delay)
+        return ChatResult(generations=[ChatGeneration(message=self._reply(messages))])
+
+
+def stub_frankfurter(delay):
+    async def handler(request):
+        await asyncio.sleep(delay)
+        return httpx.Response(200, json={"amount": 1.0, "base": "USD", "rates": {"EUR": 0.9}})
+
+    currency_agent.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+async def conversation(agent, index, turns=1):
+    started = time.perf_counter()
+    for turn in range(turns):
+        # Questions differ per turn and conversation so each one can be
+        # looked up among the prompts the model saw
+        question = f"How much is {turn + 1} USD in EUR? (conversation {index})"
+        async for item in agent.stream(question, f"bench_{index}"):
+            last = item
+        if not last["is_task_complete"]:
+            raise RuntimeError(f"Conversation {index} did not complete turn {turn}: {last}")
+        if question not in prompted_questions:
+            raise RuntimeError(f"Conversation {index}: turn {turn} never reached the model")
+    return time.perf_counter() - started
+
+
+async def run(conversations, delay, turns=1, history_messages=None):
+    agent = currency_agent.CurrencyAgent(model=StubChatModel(delay=delay), history_messages=history_messages)
+    try:
+        single = await conversation(agent, "warmup", turns)
+
+        started = time.perf_counter()
+        latencies = await asyncio.gather(*(conversation(agent, i, turns) for i in range(conversations)))
+        return single, time.perf_counter() - started, sorted(latencies)
+    finally:
+        # Closes the SQLite history when CURRENCY_CHECKPOINT_DB is set
+        await agent.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--conversations", type=int, default=50, help="Concurrent conversations")
+    parser.add_argument("--delay", type=float, default=0.2, help="Seconds per model turn and HTTP call")
+    parser.add_argument("--turns", type=int, default=1, help="Questions asked per conversation")
+    parser.add_argument("--history-messages", type=int, default=None,
+                        help="Messages the agent keeps per thread (default: its own default)")
+    parser.add_argument("--no-rate-cache", action="store_true", help="Expire cached rates immediately")
+    args = parser.parse_args()
+
+    if args.no_rate_cache:
+        currency_agent.rate_cache.latest_ttl = 0.0
+
+    stub_frankfurter(args.delay)
+    single, wall, latencies = asyncio.run(
+        run(args.conversations, args.delay, max(1, args.turns), args.history_messages)
+    )
+
+    serial = single * args.conversations
+    print(f"single conversation     {single * 1000:8.1f}ms")
+    print(f"{args.conversations} concurrent wall time {wall * 1000:8.1f}ms (serial would be {serial * 1000:.1f}ms)")
+    print(f"speedup                 {serial / wall:8.1f}x")
+    print(f"p50={statistics.median(latencies) * 1000:.1f}ms "
+          f"p99={latencies[int(len(latencies) * 0.99) - 1] * 1000:.1f}ms "
+          f"throughput={args.conversations / wall:.1f} conversations/s")
+    if args.turns > 1:
+        print(f"every one of the {args.turns} turns per conversation reached the model")
+    print(f"rate cache              {currency_agent.rate_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
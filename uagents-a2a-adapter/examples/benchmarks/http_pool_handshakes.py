@@ -0,0 +1,142 @@
+"""
+TLS handshake comparison: a client per request vs. a pooled client.
+
+Starts a local HTTPS server with a throwaway self-signed certificate and
+sends the same requests to it twice:
+- "ad-hoc": a new ``httpx.AsyncClient`` per request, as push notifications
+  and rate lookups used to do
+- "pooled": the shared client of one ``HTTPClientPool``
+
+The server counts accepted connections, and every connection costs one TCP
+and TLS handshake, so the difference is the number of handshakes the pool
+saves. Needs the ``openssl`` command to create the certificate.
+
+Usage:
+    python examples/benchmarks/http_pool_handshakes.py --requests 500 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import os
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+
+import httpx
+
+from uagents_a2a_adapter.http_pool import HTTPClientPool
+
+RESPONSE = b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\nContent-Type: text/plain\r\n\r\nok"
+
+
+def make_certificate(directory):
+    cert = os.path.join(directory, "cert.pem")
+    key = os.path.join(directory, "key.pem")
+    subprocess.run(
+        [
+            "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+            "-keyout", key, "-out", cert, "-subj", "/CN=localhost",
+            "-addext", "subjectAltName=IP:127.0.0.1,DNS:localhost",
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return cert, key
+
+
+class CountingServer:
+    """Minimal keep-alive HTTPS server that counts accepted connections."""
+
+    def __init__(self):
+        self.connections = 0
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                await reader.readuntil(b"\r\n\r\n")
+                writer.write(RESPONSE)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, ssl.SSLError):
+            pass
+        finally:
+            writer.close()
+
+
+async def drive(send, requests, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            response = await send()
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return time.perf_counter() - started, sum(latencies) / len(latencies)
+
+
+def serve(counter, cert, key, ready):
+    """Run the server on its own loop so its work does not skew client timings."""
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(cert, key)
+    loop = asyncio.new_event_loop()
+    server = loop.run_until_complete(asyncio.start_server(counter.handle, "127.0.0.1", 0, ssl=context))
+    ready.append((loop, server.sockets[0].getsockname()[1]))
+    loop.run_forever()
+
+
+async def run(requests, concurrency, url, counter):
+    results = {}
+
+    async def ad_hoc():
+        async with httpx.AsyncClient() as client:
+            return await client.get(url)
+
+    pool = HTTPClientPool(max_keepalive_connections=concurrency)
+    try:
+        for mode, send in (("ad-hoc", ad_hoc), ("pooled", lambda: pool.async_client().get(url))):
+            counter.connections = 0
+            elapsed, mean = await drive(send, requests, concurrency)
+            results[mode] = (counter.connections, elapsed, mean)
+    finally:
+        await pool.aclose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=500, help="Requests per mode")
+    parser.add_argument("--concurrency", type=int, default=20, help="Requests in flight at once")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        cert, key = make_certificate(directory)
+        # Let httpx trust the throwaway certificate
+        os.environ["SSL_CERT_FILE"] = cert
+        counter = CountingServer()
+        ready = []
+        threading.Thread(target=serve, args=(counter, cert, key, ready), daemon=True).start()
+        while not ready:
+            time.sleep(0.01)
+        loop, port = ready[0]
+        results = asyncio.run(run(args.requests, args.concurrency, f"https://127.0.0.1:{port}/", counter))
+        loop.call_soon_threadsafe(loop.stop)
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}")
+    for mode, (handshakes, elapsed, mean) in results.items():
+        print(
+            f"{mode:<7} handshakes={handshakes:<5} elapsed={elapsed * 1000:8.1f}ms "
+            f"mean={mean * 1000:6.2f}ms throughput={args.requests / elapsed:7.1f} req/s"
+        )
+    saved = results["ad-hoc"][0] - results["pooled"][0]
+    print(f"handshakes saved by pooling: {saved}")
+
+
+if __name__ == "__main__":
+    main()
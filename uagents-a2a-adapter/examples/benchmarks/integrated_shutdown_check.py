@@ -0,0 +1,77 @@
+"""
+Shutdown check for integrated bridge mode.
+
+Serves the app ``main.py`` serves (``create_app``) with an integrated bridge
+pool of ``--workers`` bridge uAgents on the uvicorn loop, waits until the
+bridges have started, then asks uvicorn to exit as on Ctrl+C. The bridges run
+without a mailbox, so nothing leaves this machine.
+
+The check passes if ``uvicorn.Server.serve()`` returns without an error, the
+app lifespan closed the HTTP pool and the bridge agents left no tasks running
+on the loop. It exits with status 1 otherwise.
+
+Usage:
+    python examples/benchmarks/integrated_shutdown_check.py --workers 2
+"""
+
+import argparse
+import asyncio
+import sys
+
+import uvicorn
+
+from uagents_a2a_adapter.http_pool import HTTPClientPool
+from uagents_a2a_adapter.main import create_app, create_bridge_pool, create_task_store
+
+TARGET = "agent1qtarget"
+
+
+async def run(workers, port, bridge_port):
+    bridge_pool = create_bridge_pool(
+        "a2a_shutdown_check", bridge_port, workers, "integrated",
+        agent_options={'mailbox': False},
+    )
+    http_pool = HTTPClientPool()
+    app = create_app(
+        TARGET, "127.0.0.1", port, bridge_pool,
+        http_pool=http_pool, task_store=create_task_store('memory'),
+    )
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started and not serving.done():
+        await asyncio.sleep(0.05)
+    started = all(worker.running for worker in bridge_pool.workers)
+    server.should_exit = True
+
+    problems = []
+    try:
+        await serving
+    except BaseException as e:
+        problems.append(f"serve() raised {type(e).__name__}: {e}")
+    if not started:
+        problems.append("not every bridge had started")
+    if http_pool._async_client is not None:
+        problems.append("the lifespan did not close the HTTP pool")
+    leftover = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+    if leftover:
+        problems.append(f"{len(leftover)} tasks still running: {leftover[:3]}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--workers", type=int, default=2, help="Number of bridge uAgents")
+    parser.add_argument("--port", type=int, default=10099, help="A2A server port")
+    parser.add_argument("--bridge-port", type=int, default=18082, help="Port of the first bridge uAgent")
+    args = parser.parse_args()
+
+    problems = asyncio.run(run(args.workers, args.port, args.bridge_port))
+    for problem in problems:
+        print(f"FAIL {problem}")
+    if not problems:
+        print(f"ok: {args.workers} integrated bridges shut down with the server")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Memory and startup comparison: one process per agent vs. one multi-agent process.
+
+Starts N bridged agents twice:
+- "per-process": N separate ``uagents_a2a_adapter.main`` servers, each with its
+  own A2A port and bridge uAgent
+- "shared": one server started with ``--agents-config`` that mounts all N agent
+  cards under their own path and shares one bridge pool
+
+For each layout it reports the time until every agent card answers and the
+total resident memory of the server processes. The target addresses do not
+need to exist; no messages are sent. Linux only (reads /proc for RSS).
+
+Usage:
+    python examples/benchmarks/multi_agent_footprint.py --agents 10
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+AGENT_CARD_PATH = "/.well-known/agent.json"
+
+
+def rss_mb(pid):
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def wait_for_cards(urls, timeout):
+    started = time.perf_counter()
+    pending = set(urls)
+    with httpx.Client(timeout=1.0) as client:
+        while pending and time.perf_counter() - started < timeout:
+            for url in list(pending):
+                try:
+                    if client.get(url).status_code == 200:
+                        pending.discard(url)
+                except httpx.HTTPError:
+                    pass
+            time.sleep(0.05)
+    if pending:
+        raise RuntimeError(f"{len(pending)} agent cards did not come up within {timeout}s")
+    return time.perf_counter() - started
+
+
+def fake_address(index):
+    return f"agent1qbenchmark{index:04d}"
+
+
+def run_per_process(agents, base_port, bridge_port, timeout):
+    processes = []
+    try:
+        for index in range(agents):
+            processes.append(subprocess.Popen(
+                [
+                    sys.executable, "-m", "uagents_a2a_adapter.main",
+                    "--host", "127.0.0.1",
+                    "--port", str(base_port + index),
+                    "--agent-address", fake_address(index),
+                    "--bridge-name", f"bench_bridge_{index}",
+                    "--bridge-port", str(bridge_port + index),
+                ],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            ))
+        urls = [f"http://127.0.0.1:{base_port + index}{AGENT_CARD_PATH}" for index in range(agents)]
+        startup = wait_for_cards(urls, timeout)
+        memory = sum(rss_mb(process.pid) for process in processes)
+        return startup, memory
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
+
+
+def run_shared(agents, base_port, bridge_port, timeout):
+    config = [
+        {"agent_address": fake_address(index), "name": f"Agent {index}", "path": f"agent-{index}"}
+        for index in range(agents)
+    ]
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as config_file:
+        json.dump(config, config_file)
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uagents_a2a_adapter.main",
+            "--host", "127.0.0.1",
+            "--port", str(base_port),
+            "--agents-config", config_file.name,
+            "--bridge-name", "bench_bridge_shared",
+            "--bridge-port", str(bridge_port),
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        urls = [f"http://127.0.0.1:{base_port}/agent-{index}{AGENT_CARD_PATH}" for index in range(agents)]
+        startup = wait_for_cards(urls, timeout)
+        return startup, rss_mb(process.pid)
+    finally:
+        process.terminate()
+        process.wait()
+        os.unlink(config_file.name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--agents", type=int, default=10, help="Number of bridged agents")
+    parser.add_argument("--port", type=int, default=11000, help="First A2A port")
+    parser.add_argument("--bridge-port", type=int, default=18000, help="First bridge uAgent port")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Startup timeout in seconds")
+    args = parser.parse_args()
+
+    per_process = run_per_process(args.agents, args.port, args.bridge_port, args.timeout)
+    shared = run_shared(args.agents, args.port, args.bridge_port, args.timeout)
+
+    print(f"{args.agents} agents")
+    print(f"{'per-process':<12} startup={per_process[0]:6.2f}s rss={per_process[1]:8.1f}MB")
+    print(f"{'shared':<12} startup={shared[0]:6.2f}s rss={shared[1]:8.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Reply latency benchmark: sleep polling vs. event-driven wake-up.
+
+Simulates the two halves of the A2A bridge without any network:
+- a "bridge" thread running its own event loop that delivers replies after a
+  random service time (like the uAgent bridge receiving ChatMessages)
+- the A2A server loop, where one coroutine per request waits for its reply
+
+The polling strategy mirrors the old ``_stream_via_agentverse`` loop
+(``asyncio.sleep(0.5)`` while checking a shared dict). The event strategy runs
+the shipped path: the request is registered with ``PendingRequestStore.add`` on
+the server loop, marked sent, then matched and delivered from the bridge thread
+with ``match``/``deliver`` as the bridge's chat handler does, and the waiter
+reads its reply queue. The reported latency is the delay between the reply
+landing on the bridge and the waiting coroutine observing it.
+
+Usage:
+    python examples/benchmarks/reply_latency_benchmark.py --requests 200
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import threading
+import time
+from uuid import uuid4
+
+from uagents_a2a_adapter.pending_requests import PendingRequestStore
+
+TARGET = "agent1qtarget"
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class BridgeThread:
+    """Background event loop standing in for the uAgent bridge."""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
+    def deliver_later(self, delay, callback):
+        self.loop.call_soon_threadsafe(self.loop.call_later, delay, callback)
+
+
+async def run_polling(bridge, service_times, poll_interval):
+    response_cache = {}
+    delivered_at = {}
+
+    async def wait_for_reply(request_id, service_time):
+        def deliver():
+            delivered_at[request_id] = time.perf_counter()
+            response_cache[request_id] = f"reply {request_id}"
+
+        bridge.deliver_later(service_time, deliver)
+        while request_id not in response_cache:
+            await asyncio.sleep(poll_interval)
+        response_cache.pop(request_id)
+        return time.perf_counter() - delivered_at[request_id]
+
+    return await asyncio.gather(
+        *(wait_for_reply(i, t) for i, t in enumerate(service_times))
+    )
+
+
+async def run_event_driven(bridge, service_times):
+    store = PendingRequestStore()
+    delivered_at = {}
+
+    async def wait_for_reply(i, service_time):
+        request_id, replies = store.add(f"query {i}", context_id=f"ctx_{i}")
+        msg_id = str(uuid4())
+        store.mark_sent(request_id, msg_id, TARGET)
+
+        def deliver():
+            matched = store.match(TARGET, in_reply_to=msg_id, context_id=f"ctx_{i}")
+            delivered_at[i] = time.perf_counter()
+            store.deliver(matched, {'parts': [f"reply {i}"], 'metadata': {'in_reply_to': msg_id}}, final=True)
+
+        bridge.deliver_later(service_time, deliver)
+        reply = await replies.get()
+        observed = time.perf_counter()
+        assert reply['parts'] == [f"reply {i}"], reply
+        return observed - delivered_at[i]
+
+    return await asyncio.gather(
+        *(wait_for_reply(i, t) for i, t in enumerate(service_times))
+    )
+
+
+def report(name, samples):
+    samples_ms = [s * 1000 for s in samples]
+    print(
+        f"{name:<14} p50={percentile(samples_ms, 50):8.2f}ms "
+        f"p99={percentile(samples_ms, 99):8.2f}ms "
+        f"mean={statistics.mean(samples_ms):8.2f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=200, help="Number of concurrent requests")
+    parser.add_argument("--min-service", type=float, default=0.05, help="Minimum reply delay in seconds")
+    parser.add_argument("--max-service", type=float, default=1.5, help="Maximum reply delay in seconds")
+    parser.add_argument("--poll-interval", type=float, default=0.5, help="Sleep interval of the polling loop")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    service_times = [rng.uniform(args.min_service, args.max_service) for _ in range(args.requests)]
+
+    with BridgeThread() as bridge:
+        polling = asyncio.run(run_polling(bridge, service_times, args.poll_interval))
+        event_driven = asyncio.run(run_event_driven(bridge, service_times))
+
+    print(f"{args.requests} requests, reply delays {args.min_service}-{args.max_service}s")
+    report("polling", polling)
+    report("event-driven", event_driven)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,61 @@
+import asyncio
+import logging
 import os
+import time
 
+from collections import OrderedDict
 from collections.abc import AsyncIterable
 from typing import Any, Literal
 
 import httpx
 
-from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.messages import AIMessage, RemoveMessage, ToolMessage, trim_messages
 from langchain_core.tools import tool
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_openai import ChatOpenAI
 from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph.message import REMOVE_ALL_MESSAGES
 from langgraph.prebuilt import create_react_agent
 from pydantic import BaseModel
+from rate_cache import RateCache
 
 
-memory = MemorySaver()
+logger = logging.getLogger(__name__)
+
+# One keep-alive connection pool for every rate lookup; close it with
+# ``await http_client.aclose()`` on shutdown
+http_client = httpx.AsyncClient(
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=10),
+    timeout=30.0,
+)
+
+
+class RateAPIError(Exception):
+    """Raised when the Frankfurter API returns an unexpected payload."""
+
+
+async def fetch_rates(base: str, currency_date: str) -> dict[str, Any]:
+    """Fetch the rates from ``base`` to every currency on ``currency_date``."""
+    response = await http_client.get(
+        f'https://api.frankfurter.app/{currency_date}',
+        params={'from': base},
+    )
+    response.raise_for_status()
+
+    data = response.json()
+    if 'rates' not in data or 'base' not in data:
+        raise RateAPIError('Invalid API response format.')
+    return data
+
+
+rate_cache = RateCache(
+    fetch_rates,
+    latest_ttl=float(os.getenv('RATE_CACHE_LATEST_TTL', '300')),
+)
 
 
 @tool
-def get_exchange_rate(
+async def get_exchange_rate(
     currency_from: str = 'USD',
     currency_to: str = 'EUR',
     currency_date: str = 'latest',
@@ -36,22 +73,69 @@ def get_exchange_rate(
         the request fails.
     """
     try:
-        response = httpx.get(
-            f'https://api.frankfurter.app/{currency_date}',
-            params={'from': currency_from, 'to': currency_to},
-        )
-        response.raise_for_status()
-
-        data = response.json()
-        if 'rates' not in data:
-            return {'error': 'Invalid API response format.'}
+        data = await rate_cache.get_rate(currency_from, currency_to, currency_date)
+        if data is None:
+            return {'error': f'No exchange rate available for {currency_to}.'}
         return data
     except httpx.HTTPError as e:
         return {'error': f'API request failed: {e}'}
+    except RateAPIError as e:
+        return {'error': str(e)}
     except ValueError:
         return {'error': 'Invalid JSON response from API.'}
 
 
+async def open_checkpointer(path: str | None = None):
+    """Open a SQLite checkpointer for ``path``, or return a MemorySaver.
+
+    The SQLite checkpointer needs the optional ``langgraph-checkpoint-sqlite``
+    package; without it, or without a path, history is kept in memory. It
+    belongs to the running event loop, so call this from the loop the agent
+    streams on and close it there (``await saver.conn.close()``).
+    """
+    if path:
+        try:
+            import aiosqlite
+            from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+        except ImportError:
+            logger.warning(
+                'langgraph-checkpoint-sqlite is not installed; keeping conversation history in memory'
+            )
+        else:
+            return AsyncSqliteSaver(await aiosqlite.connect(path))
+    return MemorySaver()
+
+
+def window_history(max_messages: int):
+    """Build a pre-model hook that keeps only the last ``max_messages`` messages.
+
+    Older messages are removed from the thread state itself, so both the
+    prompt sent to the model and the stored checkpoint stay bounded. The
+    window always starts on a user message so tool calls keep their results.
+
+    ``llm_input_messages`` is set on every call: it stays in the graph state,
+    and the model reads it in preference to ``messages``, so a stale value
+    would hide the newest turn.
+    """
+
+    def pre_model_hook(state):
+        messages = state['messages']
+        if len(messages) <= max_messages:
+            return {'llm_input_messages': messages}
+        kept = trim_messages(
+            messages,
+            strategy='last',
+            token_counter=len,
+            max_tokens=max_messages,
+            start_on='human',
+            end_on=('human', 'tool'),
+            include_system=True,
+        )
+        return {'messages': [RemoveMessage(id=REMOVE_ALL_MESSAGES), *kept], 'llm_input_messages': kept}
+
+    return pre_model_hook
+
+
 class ResponseFormat(BaseModel):
     """Respond to the user in this format."""
 
@@ -76,9 +160,30 @@ class CurrencyAgent:
         'Set response status to completed if the request is complete.'
     )
 
-    def __init__(self):
+    def __init__(
+        self,
+        model=None,
+        checkpointer=None,
+        history_messages: int | None = None,
+        thread_idle_ttl: float | None = None,
+        max_threads: int = 10000,
+    ):
+        """
+        Args:
+            model: Chat model to use (default: from the model_source env var)
+            checkpointer: LangGraph checkpointer (default: SQLite at
+                CURRENCY_CHECKPOINT_DB if set, else in memory). The SQLite
+                one is opened by ``start`` on the agent's event loop.
+            history_messages: Messages per thread sent to the model and kept
+                (default: CURRENCY_HISTORY_MESSAGES or 20)
+            thread_idle_ttl: Seconds after which an idle thread's history is
+                deleted (default: CURRENCY_THREAD_IDLE_TTL or 3600)
+            max_threads: Threads kept before the least recently used is deleted
+        """
         model_source = os.getenv('model_source', 'google')
-        if model_source == 'google':
+        if model is not None:
+            self.model = model
+        elif model_source == 'google':
             self.model = ChatGoogleGenerativeAI(model='gemini-2.0-flash')
         else:
             self.model = ChatOpenAI(
@@ -88,20 +193,57 @@ class CurrencyAgent:
                 temperature=0,
             )
         self.tools = [get_exchange_rate]
+        self.checkpointer = checkpointer
+        self.checkpoint_db = os.getenv('CURRENCY_CHECKPOINT_DB')
+        self.history_messages = history_messages or int(os.getenv('CURRENCY_HISTORY_MESSAGES', '20'))
+        self.thread_idle_ttl = thread_idle_ttl or float(os.getenv('CURRENCY_THREAD_IDLE_TTL', '3600'))
+        self.max_threads = max_threads
+        # thread_id -> last use, least recently used first
+        self._threads: OrderedDict[str, float] = OrderedDict()
+        # Built by start(), once the checkpointer is open
+        self.graph = None
+        self._owns_checkpointer = False
+        self._starting = asyncio.Lock()
 
-        self.graph = create_react_agent(
-            self.model,
-            tools=self.tools,
-            checkpointer=memory,
-            prompt=self.SYSTEM_INSTRUCTION,
-            response_format=(self.FORMAT_INSTRUCTION, ResponseFormat),
-        )
+    async def start(self):
+        """Open the checkpointer on the running loop and build the graph.
+
+        Called by ``stream`` on first use if it has not been called yet.
+        """
+        async with self._starting:
+            if self.graph is not None:
+                return
+            if self.checkpointer is None:
+                self.checkpointer = await open_checkpointer(self.checkpoint_db)
+                self._owns_checkpointer = True
+            self.graph = create_react_agent(
+                self.model,
+                tools=self.tools,
+                checkpointer=self.checkpointer,
+                prompt=self.SYSTEM_INSTRUCTION,
+                response_format=(self.FORMAT_INSTRUCTION, ResponseFormat),
+                pre_model_hook=window_history(self.history_messages),
+            )
+
+    async def aclose(self):
+        """Close the SQLite checkpointer opened by ``start``, if any."""
+        if self._owns_checkpointer:
+            if hasattr(self.checkpointer, 'conn'):
+                await self.checkpointer.conn.close()
+            self.checkpointer = None
+            self._owns_checkpointer = False
+        self.graph = None
 
     async def stream(self, query, context_id) -> AsyncIterable[dict[str, Any]]:
+        if self.graph is None:
+            await self.start()
         inputs = {'messages': [('user', query)]}
         config = {'configurable': {'thread_id': context_id}}
+        await self._touch_thread(context_id)
 
-        for item in self.graph.stream(inputs, config, stream_mode='values'):
+        # astream awaits the model and the tool, so other conversations on
+        # the same event loop keep making progress meanwhile
+        async for item in self.graph.astream(inputs, config, stream_mode='values'):
             message = item['messages'][-1]
             if (
                 isinstance(message, AIMessage)
@@ -112,42 +254,63 @@ class CurrencyAgent:
                     'is_task_complete': False,
                     'require_user_input': False,
                     'content': 'Looking up the exchange rates...',
+                    'stage': 'tool_call',
                 }
             elif isinstance(message, ToolMessage):
                 yield {
                     'is_task_complete': False,
                     'require_user_input': False,
                     'content': 'Processing the exchange rates..',
+                    'stage': 'tool_result',
                 }
 
-        yield self.get_agent_response(config)
+        yield dict(await self.get_agent_response(config), stage='final')
+
+    async def _touch_thread(self, thread_id: str):
+        """Mark a thread as used and delete threads that have gone idle."""
+        now = time.monotonic()
+        self._threads.pop(thread_id, None)
+        self._threads[thread_id] = now
+        while self._threads:
+            oldest, last_used = next(iter(self._threads.items()))
+            if now - last_used < self.thread_idle_ttl and len(self._threads) <= self.max_threads:
+                break
+            del self._threads[oldest]
+            try:
+                await self.checkpointer.adelete_thread(oldest)
+            except Exception as e:
+                logger.warning(f'Failed to delete idle thread {oldest}: {e}')
 
-    def get_agent_response(self, config):
-        current_state = self.graph.get_state(config)
+    async def get_agent_response(self, config):
+        current_state = await self.graph.aget_state(config)
         structured_response = current_state.values.get('structured_response')
         if structured_response and isinstance(
             structured_response, ResponseFormat
         ):
             if structured_response.status == 'input_required':
                 return {
+                    'status': 'input_required',
                     'is_task_complete': False,
                     'require_user_input': True,
                     'content': structured_response.message,
                 }
             if structured_response.status == 'error':
                 return {
+                    'status': 'error',
                     'is_task_complete': False,
                     'require_user_input': True,
                     'content': structured_response.message,
                 }
             if structured_response.status == 'completed':
                 return {
+                    'status': 'completed',
                     'is_task_complete': True,
                     'require_user_input': False,
                     'content': structured_response.message,
                 }
 
         return {
+            'status': 'error',
             'is_task_complete': False,
             'require_user_input': True,
             'content': (
@@ -4,17 +4,19 @@ Direct uAgent wrapper for CurrencyAgent with Agentverse registration.
 
 import os
 import asyncio
+import re
 import threading
 import time
-import requests
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
 from datetime import datetime, timezone
 from uuid import uuid4
 
+import httpx
 from uagents import Agent, Context, Model, Protocol
 from uagents_core.contrib.protocols.chat import (
     ChatMessage, 
     ChatAcknowledgement,
+    MetadataContent,
     TextContent,
     chat_protocol_spec
 )
@@ -22,7 +24,7 @@ from pydantic import BaseModel
 
 # Import CurrencyAgent - adjust path as needed
 try:
-    from agent import CurrencyAgent
+    from agent import CurrencyAgent, http_client, rate_cache
 except ImportError:
     # If app.agent doesn't exist, you can put CurrencyAgent code directly here
     # or adjust the import path to match your file structure
@@ -46,36 +48,60 @@ class CurrencyResponse(Model):
     agent_address: str
     timestamp: int
 
+class RateCacheStats(Model):
+    hits: int
+    misses: int
+    coalesced: int
+    tables: int
+    hit_ratio: float
+
 # Chat protocol setup
 chat_proto = Protocol(spec=chat_protocol_spec)
 
+# Context tag older bridges put in front of the query text
+USER_CONTEXT_PREFIX = re.compile(r"^\[USER_CONTEXT:([^\]]+)\]\s*")
+
 class CurrencyUAgent:
     """uAgent wrapper for CurrencyAgent with Agentverse registration."""
     
-    def __init__(self, name: str, port: int, api_token: str = None):
+    def __init__(self, name: str, port: int, api_token: str = None, stream_progress: bool = False,
+                 direct_peers: Optional[Dict[str, str]] = None):
         self.name = name
         self.port = port
         self.api_token = api_token
+        # Send every progress item as its own chat message instead of only the
+        # final answer; senders can also ask for this with {"stream": "true"}
+        self.stream_progress = stream_progress
         
         # Initialize the LangGraph currency agent
         self.currency_agent = CurrencyAgent()
         
-        # Create uAgent with mailbox for Agentverse discovery
+        # Create uAgent with mailbox for Agentverse discovery. Replies to
+        # co-located peers (e.g. the A2A bridge) go to their local endpoint
+        # first and fall back to the mailbox. Only this needs the adapter
+        # package, so the agent runs without it when no peers are set
+        resolver = None
+        if direct_peers:
+            from uagents_a2a_adapter.direct_transport import DirectEndpointResolver
+            resolver = DirectEndpointResolver(direct_peers)
         self.uagent = Agent(
             name=name,
             port=port,
             seed=f"currency2_{name}_{port}",
-            mailbox=True  # Enable for Agentverse registration
+            mailbox=True,  # Enable for Agentverse registration
+            resolve=resolver,
         )
         
         self.agent_address = None
         self.is_running = False
+        # Chat requests being answered, by msg_id
+        self._chat_tasks: Dict[str, asyncio.Task] = {}
         
         # Setup handlers
         self._setup_handlers()
         
         # Setup REST endpoints
-        
+        self._setup_rest_endpoints()
     
     def _setup_handlers(self):
         """Setup message handlers for the uAgent."""
@@ -83,10 +109,18 @@ class CurrencyUAgent:
         @self.uagent.on_event("startup")
         async def startup(ctx: Context):
             self.agent_address = ctx.agent.address
+            # Opens the conversation store on this agent's loop
+            await self.currency_agent.start()
             self.is_running = True
             ctx.logger.info(f"Currency uAgent '{self.name}' started")
             ctx.logger.info(f"Address: {self.agent_address}")
         
+        @self.uagent.on_event("shutdown")
+        async def shutdown(ctx: Context):
+            # Close the pooled connections used for rate lookups
+            await http_client.aclose()
+            await self.currency_agent.aclose()
+        
         @self.uagent.on_message(model=QueryMessage)
         async def handle_query(ctx: Context, sender: str, msg: QueryMessage):
             """Handle direct query messages."""
@@ -118,49 +152,43 @@ class CurrencyUAgent:
         @chat_proto.on_message(ChatMessage)
         async def handle_chat_message(ctx: Context, sender: str, msg: ChatMessage):
             """Handle chat protocol messages for Agentverse discovery."""
-            try:
-                ctx.logger.info(f"Chat message from {sender}")
-                
-                # Send acknowledgment
-                await ctx.send(sender, ChatAcknowledgement(
-                    timestamp=datetime.now(timezone.utc),
-                    acknowledged_msg_id=msg.msg_id
-                ))
-                
-                # Process text content
-                for item in msg.content:
-                    if isinstance(item, TextContent):
-                        ctx.logger.info(f"Processing text: {item.text}")
-                        
-                        # Process through currency agent
-                        response_content = ""
-                        async for stream_item in self.currency_agent.stream(item.text, str(ctx.session)):
-                            if stream_item['is_task_complete']:
-                                response_content = stream_item['content']
-                                break
-                            elif stream_item['require_user_input']:
-                                response_content = stream_item['content']
-                                break
-                        
-                        if not response_content:
-                            response_content = "Unable to process your currency request."
-                        
-                        # Send chat response
-                        chat_response = ChatMessage(
-                            timestamp=datetime.now(timezone.utc),
-                            msg_id=uuid4(),
-                            content=[TextContent(type="text", text=response_content)]
-                        )
-                        await ctx.send(sender, chat_response)
-                        
-            except Exception as e:
-                ctx.logger.error(f"Error in chat handler: {str(e)}")
-                error_response = ChatMessage(
-                    timestamp=datetime.now(timezone.utc),
-                    msg_id=uuid4(),
-                    content=[TextContent(type="text", text=f"Sorry, I encountered an error: {str(e)}")]
-                )
-                await ctx.send(sender, error_response)
+            ctx.logger.info(f"Chat message from {sender}")
+            
+            # Send acknowledgment
+            await ctx.send(sender, ChatAcknowledgement(
+                timestamp=datetime.now(timezone.utc),
+                acknowledged_msg_id=msg.msg_id
+            ))
+            
+            request_metadata = {}
+            for item in msg.content:
+                if isinstance(item, MetadataContent):
+                    request_metadata.update(item.metadata)
+            
+            # A cancel notice names the msg_id of a request the sender no
+            # longer waits for; stop answering it
+            if 'cancel' in request_metadata:
+                answer = self._chat_tasks.pop(request_metadata['cancel'], None)
+                if answer is not None:
+                    answer.cancel()
+                    ctx.logger.info(f"Canceled request {request_metadata['cancel']} from {sender}")
+                return
+            
+            # The sender stops waiting at its deadline; work past it is wasted
+            remaining = self._time_left(request_metadata)
+            if remaining is not None and remaining <= 0:
+                ctx.logger.info(f"Dropping expired request {msg.msg_id} from {sender}")
+                return
+            
+            # Answer in the background so a cancel notice for this request
+            # is handled while it is still running
+            msg_key = str(msg.msg_id)
+            answer = asyncio.create_task(self._answer_chat(ctx, sender, msg, request_metadata))
+            self._chat_tasks[msg_key] = answer
+            answer.add_done_callback(lambda _: self._chat_tasks.pop(msg_key, None))
+            if remaining is not None:
+                expiry = asyncio.get_running_loop().call_later(remaining, answer.cancel)
+                answer.add_done_callback(lambda _: expiry.cancel())
         
         @chat_proto.on_message(ChatAcknowledgement)
         async def handle_chat_ack(ctx: Context, sender: str, msg: ChatAcknowledgement):
@@ -168,6 +196,115 @@ class CurrencyUAgent:
         
         # Include chat protocol
         self.uagent.include(chat_proto)
+    
+    def _setup_rest_endpoints(self):
+        """Setup HTTP endpoints served on the uAgent's port."""
+        
+        @self.uagent.on_rest_get("/rate-cache", RateCacheStats)
+        async def rate_cache_stats(ctx: Context) -> RateCacheStats:
+            """Exchange-rate cache counters and hit ratio."""
+            return RateCacheStats(**rate_cache.stats())
+    
+    async def _answer_chat(self, ctx: Context, sender: str, msg: ChatMessage, request_metadata: Dict[str, str]):
+        """Run a chat request through the currency agent and send the reply."""
+        try:
+            # Echo the request's msg_id and A2A context so the bridge can
+            # route the reply to the right task
+            reply_metadata = {'in_reply_to': str(msg.msg_id)}
+            if 'context_id' in request_metadata:
+                reply_metadata['context_id'] = request_metadata['context_id']
+            stream_progress = self.stream_progress or request_metadata.get('stream') == 'true'
+            
+            # Process text content
+            for item in msg.content:
+                if isinstance(item, TextContent):
+                    text, thread_id = self._conversation(ctx, item.text, request_metadata)
+                    ctx.logger.info(f"Processing text: {text}")
+                    started = time.monotonic()
+                    seq = 0
+                    
+                    # Process through currency agent
+                    response_content = ""
+                    status = 'error'
+                    async for stream_item in self.currency_agent.stream(text, thread_id):
+                        final = stream_item['is_task_complete'] or stream_item['require_user_input']
+                        if stream_progress:
+                            # Each item goes out on its own, numbered and
+                            # timed so per-stage latency can be measured
+                            item_metadata = dict(
+                                reply_metadata,
+                                seq=str(seq),
+                                final=str(final).lower(),
+                                stage=stream_item.get('stage', ''),
+                                elapsed_ms=str(int((time.monotonic() - started) * 1000)),
+                            )
+                            if final:
+                                item_metadata['status'] = stream_item['status']
+                            await ctx.send(sender, self._chat_reply(stream_item['content'], item_metadata))
+                            seq += 1
+                        if final:
+                            response_content = stream_item['content']
+                            status = stream_item['status']
+                            break
+                    
+                    if stream_progress and response_content:
+                        continue
+                    
+                    if not response_content:
+                        response_content = "Unable to process your currency request."
+                    
+                    # Send chat response with an explicit status so the
+                    # bridge does not have to guess it from the text
+                    final_metadata = dict(reply_metadata, status=status)
+                    if stream_progress:
+                        final_metadata.update(seq=str(seq), final='true')
+                    await ctx.send(sender, self._chat_reply(response_content, final_metadata))
+                    
+        except Exception as e:
+            ctx.logger.error(f"Error in chat handler: {str(e)}")
+            error_response = self._chat_reply(
+                f"Sorry, I encountered an error: {str(e)}",
+                {'in_reply_to': str(msg.msg_id), 'final': 'true', 'status': 'error'},
+            )
+            await ctx.send(sender, error_response)
+    
+    @staticmethod
+    def _conversation(ctx: Context, text: str, request_metadata: Dict[str, str]) -> Tuple[str, str]:
+        """
+        Query text and LangGraph thread id for a chat request.
+
+        The bridge sends every turn of an A2A context in the same uAgent
+        session and names it as ``session_id`` in the metadata, so follow-ups
+        resume the checkpointed conversation. Older bridges put the context
+        in front of the text instead; ``ctx.session`` is the last resort,
+        for other senders.
+        """
+        thread_id = request_metadata.get('session_id') or request_metadata.get('context_id')
+        match = USER_CONTEXT_PREFIX.match(text)
+        if match:
+            text = text[match.end():]
+            thread_id = thread_id or match.group(1)
+        return text, thread_id or str(ctx.session)
+    
+    @staticmethod
+    def _time_left(request_metadata: Dict[str, str]) -> Optional[float]:
+        """Seconds until the request's ``deadline`` (Unix time), or None without one."""
+        try:
+            return float(request_metadata['deadline']) - time.time()
+        except (KeyError, ValueError):
+            return None
+    
+    @staticmethod
+    def _chat_reply(text: str, metadata: Dict[str, str]) -> ChatMessage:
+        """Build a chat reply carrying correlation and streaming metadata."""
+        return ChatMessage(
+            timestamp=datetime.now(timezone.utc),
+            msg_id=uuid4(),
+            content=[
+                TextContent(type="text", text=text),
+                MetadataContent(type="metadata", metadata=metadata),
+            ]
+        )
         
     
     def start(self):
@@ -200,6 +337,8 @@ class CurrencyUAgent:
     
     def _register_with_agentverse(self):
         """Register the agent with Agentverse."""
+        # One client, so both calls reuse its connections
+        client = httpx.Client(timeout=30.0)
         try:
             print(f"🔗 Registering '{self.name}' with Agentverse...")
             
@@ -219,7 +358,7 @@ class CurrencyUAgent:
             }
             
             try:
-                connect_response = requests.post(connect_url, json=connect_payload, headers=headers)
+                connect_response = client.post(connect_url, json=connect_payload, headers=headers)
                 if connect_response.status_code == 200:
                     print(f"✅ Connected '{self.name}' to Agentverse")
                 else:
@@ -274,7 +413,7 @@ response: str
             }
             
             try:
-                update_response = requests.put(update_url, json=update_payload, headers=headers)
+                update_response = client.put(update_url, json=update_payload, headers=headers)
                 if update_response.status_code == 200:
                     print(f"✅ Updated '{self.name}' info on Agentverse")
                     print(f"🌍 Agent discoverable at: https://agentverse.ai/agents/{self.agent_address}")
@@ -285,6 +424,8 @@ response: str
                 
         except Exception as e:
             print(f"❌ Error in Agentverse registration: {str(e)}")
+        finally:
+            client.close()
     
     def get_info(self) -> Dict[str, Any]:
         """Get agent information."""
@@ -293,7 +434,8 @@ response: str
             "port": self.port,
             "address": self.agent_address,
             "is_running": self.is_running,
-            "agentverse_registered": bool(self.api_token)
+            "agentverse_registered": bool(self.api_token),
+            "rate_cache": rate_cache.stats()
         }
 
 # Usage
@@ -307,7 +449,13 @@ if __name__ == "__main__":
     currency_uagent = CurrencyUAgent(
         name="currency_exchange_agent",
         port=8007,
-        api_token=API_TOKEN
+        api_token=API_TOKEN,
+        stream_progress=os.getenv("CURRENCY_STREAM_PROGRESS", "false").lower() == "true",
+        # e.g. "agent1q...=http://127.0.0.1:8082/submit" for a bridge on this host
+        direct_peers=dict(
+            peer.strip().split("=", 1)
+            for peer in os.getenv("CURRENCY_DIRECT_PEERS", "").split(",") if "=" in peer
+        ),
     )
     
     if currency_uagent.start():
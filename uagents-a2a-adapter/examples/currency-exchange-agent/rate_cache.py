@@ -0,0 +1,155 @@
+"""
+Exchange-rate cache for the currency agent.
+
+Rates are fetched per base currency and date: one upstream call returns the
+rates from that base to every currency, and any pair whose two currencies
+appear in a cached table is answered from it. Tables for past dates never
+change and are kept until the cache is full; tables for "latest" (or for
+today, which the ECB may still publish) expire after a short TTL.
+Concurrent lookups that need the same table share one upstream call.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+Fetcher = Callable[[str, str], Awaitable[Dict[str, Any]]]
+
+
+class RateCache:
+    """Cache of Frankfurter rate tables keyed on (base currency, date)."""
+
+    def __init__(self, fetch: Fetcher, latest_ttl: float = 300.0, max_entries: int = 1024):
+        """
+        Args:
+            fetch: Coroutine ``fetch(base, date)`` returning the Frankfurter
+                response for all rates from ``base`` on ``date``
+            latest_ttl: Seconds a "latest" or same-day table is reused (default: 300)
+            max_entries: Maximum number of tables kept, least recently used
+                first out (default: 1024)
+        """
+        self.fetch = fetch
+        self.latest_ttl = latest_ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._tables: "OrderedDict[Tuple[str, str], Tuple[Dict[str, Any], Optional[float]]]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._tables)
+
+    async def get_rate(self, currency_from: str, currency_to: str, currency_date: str = 'latest') -> Dict[str, Any]:
+        """
+        Return the Frankfurter-shaped answer for one pair.
+
+        Args:
+            currency_from: Base currency, e.g. "USD"
+            currency_to: Target currency, or several separated by commas
+            currency_date: "latest" or a YYYY-MM-DD date
+
+        Returns:
+            A dict with ``amount``, ``base``, ``date`` and ``rates`` for the
+            requested target currencies, or None if the upstream table has
+            no rate for one of them
+
+        Raises:
+            Whatever ``fetch`` raises; failed lookups are not cached.
+        """
+        currency_from = currency_from.upper()
+        targets = [code.strip().upper() for code in currency_to.split(',') if code.strip()]
+
+        answer = self._lookup(currency_from, targets, currency_date)
+        if answer is not None:
+            self.hits += 1
+            return answer
+
+        self.misses += 1
+        table = await self._fetch_table(currency_from, currency_date)
+        return self._derive(table, currency_from, targets)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return lookup counters and the hit ratio."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+            'tables': len(self._tables),
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+        }
+
+    def _lookup(self, currency_from: str, targets, currency_date: str) -> Optional[Dict[str, Any]]:
+        now = time.monotonic()
+        # The table for the requested base is the likeliest match, then any
+        # other base for the same date that covers both currencies
+        keys = [(currency_from, currency_date)] if (currency_from, currency_date) in self._tables else []
+        for key in keys + list(self._tables):
+            if key not in self._tables:
+                continue
+            if key[1] != currency_date:
+                continue
+            table, expires = self._tables[key]
+            if expires is not None and expires <= now:
+                del self._tables[key]
+                continue
+            answer = self._derive(table, currency_from, targets)
+            if answer is not None:
+                self._tables.move_to_end(key)
+                return answer
+        return None
+
+    @staticmethod
+    def _derive(table: Dict[str, Any], currency_from: str, targets) -> Optional[Dict[str, Any]]:
+        # A table holds base->X for every X, so from->to is rates[to] / rates[from]
+        rates = dict(table['rates'], **{table['base']: 1.0})
+        if currency_from not in rates or any(target not in rates for target in targets):
+            return None
+        divisor = rates[currency_from]
+        return {
+            'amount': 1.0,
+            'base': currency_from,
+            'date': table.get('date'),
+            'rates': {target: round(rates[target] / divisor, 5) for target in targets},
+        }
+
+    async def _fetch_table(self, base: str, currency_date: str) -> Dict[str, Any]:
+        key = (base, currency_date)
+        fetch = self._inflight.get(key)
+        if fetch is not None:
+            self.coalesced += 1
+        else:
+            # The upstream call runs as its own task, so a caller that is
+            # cancelled does not cancel it for the others waiting on it
+            fetch = asyncio.ensure_future(self._fetch_and_store(key))
+            self._inflight[key] = fetch
+            fetch.add_done_callback(lambda done: self._fetch_done(key, done))
+        return await asyncio.shield(fetch)
+
+    async def _fetch_and_store(self, key: Tuple[str, str]) -> Dict[str, Any]:
+        table = await self.fetch(*key)
+        self._store(key, table)
+        return table
+
+    def _fetch_done(self, key: Tuple[str, str], fetch: asyncio.Future):
+        self._inflight.pop(key, None)
+        if not fetch.cancelled():
+            # Mark the exception retrieved in case nobody else was waiting
+            fetch.exception()
+
+    def _store(self, key: Tuple[str, str], table: Dict[str, Any]):
+        expires = None if self._is_historical(key[1]) else time.monotonic() + self.latest_ttl
+        self._tables[key] = (table, expires)
+        self._tables.move_to_end(key)
+        while len(self._tables) > self.max_entries:
+            self._tables.popitem(last=False)
+
+    @staticmethod
+    def _is_historical(currency_date: str) -> bool:
+        try:
+            return date.fromisoformat(currency_date) < datetime.now(timezone.utc).date()
+        except ValueError:
+            return False
@@ -1,8 +1,21 @@
 """uAgents A2A Adapter Package."""
 
 from .adapter import A2ARegisterTool
+from .admission import AdmissionController
 from .main import main
 from .agentverse_agent_executor import AgentverseAgentExecutor
+from .bridge import BridgePool
+from .direct_transport import CachedResolver, DirectEndpointResolver
+from .http_pool import HTTPClientPool
+from .metrics import BridgeMetrics, metrics_route
+from .multi_agent import ExecutorRegistry
+from .push_notifications import BatchedPushNotifier
+from .response_cache import ResponseCache
+from .status_classifier import StatusClassifier
+from .task_store import SQLiteTaskStore
 
 __version__ = "0.1.0"
-__all__ = ["A2ARegisterTool", "main", "AgentverseAgentExecutor"]
+__all__ = ["A2ARegisterTool", "main", "AgentverseAgentExecutor", "BridgePool", "ExecutorRegistry", "HTTPClientPool",
+           "BatchedPushNotifier", "SQLiteTaskStore",
+           "StatusClassifier", "AdmissionController", "BridgeMetrics", "metrics_route",
+           "CachedResolver", "DirectEndpointResolver", "ResponseCache"]
@@ -5,6 +5,46 @@ from pydantic import BaseModel, Field
 import asyncio
 import logging
 
+# Bridge pools already running in this process, keyed by (bridge_name, bridge_port),
+# so repeated invoke() calls share them instead of fighting over the bridge port
+_bridge_pools: Dict[tuple, Any] = {}
+
+
+def _get_bridge_pool(bridge_name: str, bridge_port: int, bridge_workers: int):
+    """
+    Return the running bridge pool for this name and port, starting it on first use.
+
+    Raises:
+        ValueError: The pool already runs with a different number of workers;
+            a second pool could not bind the same ports
+    """
+    from .bridge import BridgePool
+
+    key = (bridge_name, bridge_port)
+    bridge_pool = _bridge_pools.get(key)
+    if bridge_pool is None:
+        bridge_pool = BridgePool(
+            bridge_name=bridge_name,
+            bridge_port=bridge_port,
+            workers=bridge_workers,
+        )
+        bridge_pool.start()
+        _bridge_pools[key] = bridge_pool
+    elif len(bridge_pool.workers) != bridge_workers:
+        raise ValueError(
+            f"Bridge {bridge_name} on port {bridge_port} already runs with "
+            f"{len(bridge_pool.workers)} workers, not {bridge_workers}"
+        )
+    return bridge_pool
+
+
+def _create_task_store(task_db: Optional[str]):
+    """SQLite task store at ``task_db`` if given, else one in memory, so nothing is written unasked."""
+    from a2a.server.tasks import InMemoryTaskStore
+    from .task_store import SQLiteTaskStore
+
+    return SQLiteTaskStore(path=task_db) if task_db else InMemoryTaskStore()
+
 
 class A2ARegisterTool(BaseModel):
     """Tool to register a uAgent as an A2A HTTP endpoint."""
@@ -15,22 +55,36 @@ class A2ARegisterTool(BaseModel):
         
         Args:
             params: Dictionary containing:
-                - agent_address (str): Required - The uAgent address to bridge to
+                - agent_address (str): Required unless agents is given - The uAgent address to bridge to
+                - agent_endpoint (str): Optional - Local endpoint of the uAgent, used before
+                  the mailbox (e.g. "http://127.0.0.1:8007/submit")
+                - response_cache_ttl (float): Optional - Seconds completed answers are reused
+                  for identical new queries (default: 0, no caching)
+                - stream_quiet_period (float): Optional - Seconds of silence after a partial
+                  reply before it is taken as the answer (default: 5)
+                - agents (List[dict]): Optional - Several agents to serve from one server, each
+                  with agent_address, name, description, path or virtual_host, endpoint,
+                  cache_ttl, stream_quiet_period, skill_tags and skill_examples
                 - name (str): Optional - Agent name (default: "A2A Agent")
                 - description (str): Optional - Agent description
                 - host (str): Optional - Host to bind to (default: "localhost") 
                 - port (int): Optional - Port to bind to (default: 10000)
                 - skill_tags (List[str]): Optional - List of skill tags
                 - skill_examples (List[str]): Optional - List of skill examples
+                - bridge_name (str): Optional - Base name for the bridge uAgents (default: "a2a_agentverse_bridge")
+                - bridge_port (int): Optional - Port of the first bridge uAgent (default: 8082)
+                - bridge_workers (int): Optional - Number of bridge uAgents (default: 1)
+                - task_db (str): Optional - SQLite file to keep A2A tasks in across
+                  restarts (default: tasks are kept in memory)
                 - return_dict (bool): Optional - Return dict instead of string (default: True)
                 
         Returns:
             Dict containing agent details and success status
         """
         try:
-            # Extract required parameter
+            agents = params.get("agents")
             agent_address = params.get("agent_address")
-            if not agent_address:
+            if not agent_address and not agents:
                 raise ValueError("agent_address is required")
             
             # Extract optional parameters with defaults
@@ -41,6 +95,13 @@ class A2ARegisterTool(BaseModel):
             skill_tags = params.get("skill_tags", ["general", "assistance"])
             skill_examples = params.get("skill_examples", ["Help me with my query"])
             return_dict = params.get("return_dict", True)
+            bridge_name = params.get("bridge_name", "a2a_agentverse_bridge")
+            bridge_port = params.get("bridge_port", 8082)
+            bridge_workers = params.get("bridge_workers", 1)
+            agent_endpoint = params.get("agent_endpoint")
+            response_cache_ttl = params.get("response_cache_ttl", 0)
+            stream_quiet_period = params.get("stream_quiet_period", 5.0)
+            task_db = params.get("task_db")
             
             # Ensure skill_tags and skill_examples are lists
             if isinstance(skill_tags, str):
@@ -48,6 +109,18 @@ class A2ARegisterTool(BaseModel):
             if isinstance(skill_examples, str):
                 skill_examples = [ex.strip() for ex in skill_examples.split(",")]
             
+            if agents:
+                return self._start_multi_agent_server(
+                    agents=agents,
+                    host=host,
+                    port=port,
+                    bridge_name=bridge_name,
+                    bridge_port=bridge_port,
+                    bridge_workers=bridge_workers,
+                    stream_quiet_period=stream_quiet_period,
+                    task_db=task_db
+                )
+            
             # Start the A2A server
             result = self._start_a2a_server(
                 agent_address=agent_address,
@@ -56,7 +129,14 @@ class A2ARegisterTool(BaseModel):
                 host=host,
                 port=port,
                 skill_tags=skill_tags,
-                skill_examples=skill_examples
+                skill_examples=skill_examples,
+                bridge_name=bridge_name,
+                bridge_port=bridge_port,
+                bridge_workers=bridge_workers,
+                agent_endpoint=agent_endpoint,
+                response_cache_ttl=response_cache_ttl,
+                stream_quiet_period=stream_quiet_period,
+                task_db=task_db
             )
             
             # Return the result from _start_a2a_server (already a proper dict)
@@ -68,16 +148,24 @@ class A2ARegisterTool(BaseModel):
     
     def _start_a2a_server(self, agent_address: str, name: str, description: str, 
                          host: str, port: int, skill_tags: List[str], 
-                         skill_examples: List[str]) -> Dict[str, Any]:
+                         skill_examples: List[str], bridge_name: str = "a2a_agentverse_bridge",
+                         bridge_port: int = 8082, bridge_workers: int = 1,
+                         agent_endpoint: Optional[str] = None,
+                         response_cache_ttl: float = 0,
+                         stream_quiet_period: float = 5.0,
+                         task_db: Optional[str] = None) -> Dict[str, Any]:
         """Start the A2A server with the given parameters."""
         import threading
         import uvicorn
-        import httpx
         from a2a.server.apps import A2AStarletteApplication
         from a2a.server.request_handlers import DefaultRequestHandler
-        from a2a.server.tasks import InMemoryPushNotifier, InMemoryTaskStore
         from a2a.types import AgentCapabilities, AgentCard, AgentSkill
         from .agentverse_agent_executor import AgentverseAgentExecutor
+        from .http_pool import HTTPClientPool
+        from .metrics import metrics_route
+        from .multi_agent import server_lifespan
+        from .push_notifications import BatchedPushNotifier
+        from .response_cache import ResponseCache
         
         try:
             # Create agent capabilities
@@ -105,18 +193,24 @@ class A2ARegisterTool(BaseModel):
             )
 
             # Create the bridge executor with the target agent address
+            response_cache = ResponseCache(ttl=response_cache_ttl) if response_cache_ttl else None
             bridge_executor = AgentverseAgentExecutor(
                 target_agent_address=agent_address,
-                bridge_name="a2a_agentverse_bridge",
-                bridge_port=8082
+                bridge_pool=_get_bridge_pool(bridge_name, bridge_port, bridge_workers),
+                target_endpoint=agent_endpoint,
+                response_cache=response_cache,
+                stream_quiet_period=stream_quiet_period
             )
 
-            # Create request handler
-            httpx_client = httpx.AsyncClient()
+            # Create request handler; the pool belongs to this server's loop
+            # and is closed when the server shuts down
+            http_pool = HTTPClientPool()
+            push_notifier = BatchedPushNotifier(http_pool.async_client())
+            task_store = _create_task_store(task_db)
             request_handler = DefaultRequestHandler(
                 agent_executor=bridge_executor,
-                task_store=InMemoryTaskStore(),
-                push_notifier=InMemoryPushNotifier(httpx_client),
+                task_store=task_store,
+                push_notifier=push_notifier,
             )
 
             # Create and run server
@@ -132,7 +226,13 @@ class A2ARegisterTool(BaseModel):
             
             # Start server in background thread
             def run_server():
-                uvicorn.run(server.build(), host=host, port=port)
+                lifespan = server_lifespan(bridge_executor.bridge_pool, http_pool, [push_notifier], [task_store])
+                app = server.build(lifespan=lifespan)
+                app.routes.append(metrics_route(
+                    bridge_executor.bridge_pool, bridge_executor.admission, [push_notifier], [task_store],
+                    response_caches=[response_cache] if response_cache else []
+                ))
+                uvicorn.run(app, host=host, port=port)
             
             server_thread = threading.Thread(target=run_server, daemon=True)
             server_thread.start()
@@ -141,7 +241,51 @@ class A2ARegisterTool(BaseModel):
                 "success": True,
                 "agent_address": agent_address,
                 "endpoint": f"http://{host}:{port}",
-                "agent_name": name
+                "agent_name": name,
+                "bridge_addresses": [worker["address"] for worker in bridge_executor.bridge_pool.health()]
+            }
+            
+        except Exception as e:
+            logging.error(f'Failed to start A2A server: {e}')
+            raise
+    
+    def _start_multi_agent_server(self, agents: List[Dict[str, Any]], host: str, port: int,
+                                  bridge_name: str, bridge_port: int,
+                                  bridge_workers: int, stream_quiet_period: float = 5.0,
+                                  task_db: Optional[str] = None) -> Dict[str, Any]:
+        """Start one A2A server that serves several agents over a shared bridge pool."""
+        import threading
+        import uvicorn
+        from .multi_agent import agent_path, build_multi_agent_app
+        
+        try:
+            bridge_pool = _get_bridge_pool(bridge_name, bridge_port, bridge_workers)
+            app = build_multi_agent_app(agents, host, port, bridge_pool, task_store=_create_task_store(task_db),
+                                        stream_quiet_period=stream_quiet_period)
+            
+            logging.info(f"🚀 A2A server starting on {host}:{port} for {len(agents)} agents")
+            
+            # Start server in background thread
+            def run_server():
+                uvicorn.run(app, host=host, port=port)
+            
+            server_thread = threading.Thread(target=run_server, daemon=True)
+            server_thread.start()
+            
+            return {
+                "success": True,
+                "agents": [
+                    {
+                        "agent_address": agent["agent_address"],
+                        "agent_name": agent.get("name", "A2A Agent"),
+                        "endpoint": (
+                            f"http://{agent['virtual_host']}:{port}" if agent.get("virtual_host")
+                            else f"http://{host}:{port}{agent_path(agent)}"
+                        ),
+                    }
+                    for agent in agents
+                ],
+                "bridge_addresses": [worker["address"] for worker in bridge_pool.health()]
             }
             
         except Exception as e:
@@ -0,0 +1,165 @@
+"""Admission control for requests bridged to target agents."""
+
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, Optional, Tuple
+
+
+class AdmissionRejectedError(Exception):
+    """Raised when a request cannot be admitted; ``retry_after`` is a hint in seconds."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AdmissionTimeoutError(Exception):
+    """Raised when the caller's own ``timeout`` runs out before a slot frees up."""
+
+
+class AdmissionController:
+    """
+    Concurrency limits per target agent and per A2A context.
+
+    A request runs once fewer than ``max_per_target`` requests are running
+    for its target and fewer than ``max_per_context`` for its context.
+    Otherwise it waits in a FIFO queue shared by all targets. When
+    ``max_waiting`` requests are already waiting, or a request has waited
+    ``max_wait`` seconds, it is rejected at once with a retry-after hint
+    instead of adding to the backlog, so overload shows up as fast
+    rejections rather than timeouts.
+
+    The controller belongs to the event loop that calls ``admit``.
+    """
+
+    def __init__(self, max_per_target: int = 64, max_per_context: int = 1, max_waiting: int = 256,
+                 max_wait: float = 30.0):
+        """
+        Args:
+            max_per_target: Requests running at once per target agent (default: 64)
+            max_per_context: Requests running at once per A2A context (default: 1)
+            max_waiting: Requests allowed to wait for a slot (default: 256)
+            max_wait: Seconds a request may wait before it is rejected (default: 30)
+        """
+        self.max_per_target = max_per_target
+        self.max_per_context = max_per_context
+        self.max_waiting = max_waiting
+        self.max_wait = max_wait
+        self.admitted = 0
+        self.rejected = 0
+        self._running_by_target: Dict[str, int] = {}
+        self._running_by_context: Dict[str, int] = {}
+        self._waiting: Deque[Tuple[str, str, asyncio.Future]] = deque()
+        # Moving average of how long a request holds its slot
+        self._hold_time = 1.0
+
+    @asynccontextmanager
+    async def admit(self, target: str, context_id: str, timeout: Optional[float] = None):
+        """
+        Hold a slot for ``target`` and ``context_id`` while the block runs.
+
+        Args:
+            target: Target agent address
+            context_id: A2A context id
+            timeout: Seconds the caller can wait at most, e.g. until its
+                deadline; waits end after ``max_wait`` regardless
+
+        Raises:
+            AdmissionRejectedError: The wait queue is full or ``max_wait`` elapsed
+            AdmissionTimeoutError: ``timeout`` elapsed first
+        """
+        await self._acquire(target, context_id, timeout)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._hold_time = 0.9 * self._hold_time + 0.1 * (time.monotonic() - started)
+            self._release(target, context_id)
+
+    def stats(self) -> Dict[str, int]:
+        """Return running and waiting counts and admission counters."""
+        return {
+            'running': sum(self._running_by_target.values()),
+            'waiting': len(self._waiting),
+            'max_waiting': self.max_waiting,
+            'admitted': self.admitted,
+            'rejected': self.rejected,
+        }
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely to free up, at least 1."""
+        backlog = (len(self._waiting) + 1) / max(self.max_per_target, 1)
+        return max(1, math.ceil(self._hold_time * backlog))
+
+    async def _acquire(self, target: str, context_id: str, timeout: Optional[float] = None):
+        # Earlier turns of the same conversation go first
+        queued_ahead = any(c == context_id for _, c, _ in self._waiting)
+        if not queued_ahead and self._has_room(target, context_id):
+            self._take(target, context_id)
+            return
+
+        if len(self._waiting) >= self.max_waiting:
+            self.rejected += 1
+            raise AdmissionRejectedError(
+                f"Too many requests waiting for {target}", self.retry_after()
+            )
+
+        admitted = asyncio.get_running_loop().create_future()
+        entry = (target, context_id, admitted)
+        self._waiting.append(entry)
+        # The caller's own deadline may end the wait before max_wait does
+        caller_limited = timeout is not None and timeout < self.max_wait
+        wait = max(0.0, timeout) if caller_limited else self.max_wait
+        try:
+            await asyncio.wait_for(asyncio.shield(admitted), wait)
+        except asyncio.TimeoutError:
+            self._give_up(entry)
+            if caller_limited:
+                raise AdmissionTimeoutError(f"Deadline passed waiting for a free slot for {target}")
+            self.rejected += 1
+            raise AdmissionRejectedError(
+                f"Timed out waiting for a free slot for {target}", self.retry_after()
+            )
+        except asyncio.CancelledError:
+            self._give_up(entry)
+            raise
+
+    def _give_up(self, entry: Tuple[str, str, asyncio.Future]):
+        target, context_id, admitted = entry
+        if admitted.done():
+            # The slot was granted just as the waiter left; hand it on
+            self._release(target, context_id)
+        else:
+            self._waiting.remove(entry)
+
+    def _has_room(self, target: str, context_id: str) -> bool:
+        return (self._running_by_target.get(target, 0) < self.max_per_target
+                and self._running_by_context.get(context_id, 0) < self.max_per_context)
+
+    def _take(self, target: str, context_id: str):
+        self.admitted += 1
+        self._running_by_target[target] = self._running_by_target.get(target, 0) + 1
+        self._running_by_context[context_id] = self._running_by_context.get(context_id, 0) + 1
+
+    def _release(self, target: str, context_id: str):
+        for counts, key in ((self._running_by_target, target), (self._running_by_context, context_id)):
+            counts[key] -= 1
+            if not counts[key]:
+                del counts[key]
+        self._wake_waiters()
+
+    def _wake_waiters(self):
+        # Grant slots in arrival order; a waiter that cannot run yet keeps
+        # later waiters of its conversation behind it
+        blocked_contexts = set()
+        for entry in list(self._waiting):
+            target, context_id, admitted = entry
+            if context_id not in blocked_contexts and self._has_room(target, context_id):
+                self._waiting.remove(entry)
+                self._take(target, context_id)
+                admitted.set_result(None)
+            else:
+                blocked_contexts.add(context_id)
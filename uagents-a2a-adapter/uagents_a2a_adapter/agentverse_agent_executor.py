@@ -1,9 +1,7 @@
 import logging
 import asyncio
-import threading
 import time
-from datetime import datetime, timezone
-from uuid import uuid4
+from typing import Dict, Optional
 from a2a.server.agent_execution import AgentExecutor, RequestContext
 from a2a.server.events import EventQueue
 from a2a.server.tasks import TaskUpdater
@@ -12,32 +10,38 @@ from a2a.types import (
     InvalidParamsError,
     Part,
     Task,
+    TaskNotCancelableError,
+    TaskNotFoundError,
     TaskState,
     TextPart,
-    UnsupportedOperationError,
 )
 from a2a.utils import (
-    new_agent_text_message,
+    new_agent_parts_message,
     new_task,
 )
 from a2a.utils.errors import ServerError
 
-# Import uAgent and chat protocol
-from uagents import Agent, Context, Protocol
-from uagents_core.contrib.protocols.chat import (
-    ChatMessage,
-    ChatAcknowledgement,
-    TextContent,
-    chat_protocol_spec
-)
+from .admission import AdmissionController, AdmissionRejectedError, AdmissionTimeoutError
+from .bridge import BridgePool
+from .pending_requests import RequestCanceledError
+from .response_cache import CacheKey, ResponseCache
+from .status_classifier import ERROR, INPUT_REQUIRED, StatusClassifier
+from .task_store import TERMINAL_STATES
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
 class AgentverseAgentExecutor(AgentExecutor):
     """Generic AgentExecutor that bridges to any Agentverse uAgent via chat protocol."""
     
-    def __init__(self, target_agent_address: str, bridge_name: str = "a2a_bridge", bridge_port: int = 8082):
+    def __init__(self, target_agent_address: str, bridge_name: str = "a2a_bridge", bridge_port: int = 8082,
+                 max_pending_requests: int = 10000, bridge_workers: int = 1,
+                 bridge_pool: Optional[BridgePool] = None, stream_quiet_period: float = 5.0,
+                 status_classifier: Optional[StatusClassifier] = None,
+                 admission: Optional[AdmissionController] = None, response_timeout: float = 120.0,
+                 target_endpoint: Optional[str] = None, response_cache: Optional[ResponseCache] = None,
+                 cancel_notice: Optional[bool] = None):
         """
         Initialize the bridge to a specific Agentverse agent.
         
@@ -45,111 +49,54 @@ class AgentverseAgentExecutor(AgentExecutor):
             target_agent_address: The address of the target uAgent on Agentverse
             bridge_name: Name for the bridge agent (default: "a2a_bridge")
             bridge_port: Port for the bridge agent (default: 8082)
+            max_pending_requests: Maximum number of in-flight requests kept (default: 10000)
+            bridge_workers: Number of bridge agents to spread requests over (default: 1)
+            bridge_pool: Existing, already started pool to use instead of creating one
+            stream_quiet_period: Seconds of silence after a partial reply after which
+                that reply is taken as the answer; raise it for targets that pause
+                longer between messages (default: 5)
+            status_classifier: Decides the state of the final reply (default: StatusClassifier())
+            admission: Concurrency limits, shareable between executors (default: AdmissionController())
+            response_timeout: Longest a request may take in seconds; callers can
+                ask for less with a ``timeout`` in the message metadata (default: 120)
+            target_endpoint: Local endpoint of the target (e.g. "http://127.0.0.1:8007/submit")
+                to send to directly, with the mailbox as fallback (default: mailbox only)
+            response_cache: Cache of completed answers, shareable between
+                executors; callers can bypass it with ``no_cache`` in the
+                message metadata (default: no caching)
+            cancel_notice: Tell the target about canceled tasks with a cancel
+                notice (default: the bridge pool's ``cancel_notice``)
         """
         self.target_agent_address = target_agent_address
-        self.bridge_name = bridge_name
-        self.bridge_port = bridge_port
-        self.response_cache = {}
-        self.bridge_running = False
-        self.pending_requests = {}
-        
-        # Create bridge agent with mailbox to communicate via Agentverse
-        self.bridge_agent = Agent(
-            name=bridge_name,
-            port=bridge_port,
-            seed=f"{bridge_name}_seed",
-            mailbox=True  # Enable mailbox for Agentverse communication
-        )
-        
-        # Setup chat protocol
-        self.chat_proto = Protocol(spec=chat_protocol_spec)
-        self._setup_bridge()
-        self._start_bridge()
-        
-    def _setup_bridge(self):
-        """Setup bridge agent message handlers."""
-        
-        @self.bridge_agent.on_event("startup")
-        async def bridge_startup(ctx: Context):
-            self.bridge_running = True
-            logger.info(f"A2A Bridge agent started with address: {ctx.agent.address}")
-            logger.info(f"Target Agentverse agent: {self.target_agent_address}")
-        
-        @self.chat_proto.on_message(ChatMessage)
-        async def handle_chat_response(ctx: Context, sender: str, msg: ChatMessage):
-            """Handle chat message responses from target agent."""
-            # Extract text content from chat message
-            response_text = ""
-            for content in msg.content:
-                if isinstance(content, TextContent):
-                    response_text += content.text
-            
-            # Match with pending request based on sender
-            for request_id, request_info in list(self.pending_requests.items()):
-                if request_info['target'] == sender:
-                    self.response_cache[request_id] = response_text
-                    del self.pending_requests[request_id]
-                    logger.info(f"Received chat response from {sender}: {response_text[:100]}...")
-                    
-                    # Send acknowledgment
-                    ack_msg = ChatAcknowledgement(
-                        timestamp=datetime.now(timezone.utc),
-                        acknowledged_msg_id=msg.msg_id
-                    )
-                    await ctx.send(sender, ack_msg)
-                    break
-        
-        @self.chat_proto.on_message(ChatAcknowledgement)
-        async def handle_chat_ack(ctx: Context, sender: str, msg: ChatAcknowledgement):
-            """Handle chat acknowledgments."""
-            logger.info(f"Chat message acknowledged by {sender}")
-        
-        # Add periodic task to process pending requests
-        @self.bridge_agent.on_interval(period=0.1)
-        async def process_pending_requests(ctx: Context):
-            # Process any pending requests
-            for request_id, request_info in list(self.pending_requests.items()):
-                if not request_info.get('sent', False):
-                    # Pass user context for per-user authentication
-                    # Format: [USER_CONTEXT:context_id] actual_query
-                    context_id = request_info.get('contextId', request_info.get('context_id', 'unknown'))
-                    contextual_query = f"[USER_CONTEXT:{context_id}] {request_info['query']}"
-                    
-                    # Create chat message with user context
-                    chat_msg = ChatMessage(
-                        timestamp=datetime.now(timezone.utc),
-                        msg_id=uuid4(),
-                        content=[TextContent(type="text", text=contextual_query)]
-                    )
-                    
-                    # Send to target agent
-                    await ctx.send(self.target_agent_address, chat_msg)
-                    self.pending_requests[request_id]['sent'] = True
-                    self.pending_requests[request_id]['target'] = self.target_agent_address
-                    logger.info(f"Sent chat message to {self.target_agent_address}")
-        
-        # Include chat protocol
-        self.bridge_agent.include(self.chat_proto)
-    
-    def _start_bridge(self):
-        """Start bridge agent in background thread."""
-        def run_bridge():
-            self.bridge_agent.run()
+        self.response_timeout = response_timeout
+        self.stream_quiet_period = stream_quiet_period
+        self.status_classifier = status_classifier or StatusClassifier()
+        self.admission = admission or AdmissionController()
+        self.response_cache = response_cache
+        self.cancel_notice = cancel_notice
+        # Request in flight for each running A2A task, so cancel can find it
+        self._requests_by_task: Dict[str, str] = {}
         
-        thread = threading.Thread(target=run_bridge, daemon=True)
-        thread.start()
-        
-        # Wait for bridge to start
-        max_wait = 20
-        wait_count = 0
-        while not self.bridge_running and wait_count < max_wait:
-            time.sleep(0.5)
-            wait_count += 1
-        
-        if self.bridge_running:
-            logger.info("✅ A2A Bridge to Agentverse started successfully")
-        else:
-            logger.error("❌ Failed to start A2A bridge")
+        if bridge_pool is None:
+            # Unanswered requests outlive their waiter by a grace period at most
+            bridge_pool = BridgePool(
+                bridge_name=bridge_name,
+                bridge_port=bridge_port,
+                workers=bridge_workers,
+                max_pending_requests=max_pending_requests,
+                request_ttl=self.response_timeout + 30,
+            )
+            bridge_pool.start()
+        self.bridge_pool = bridge_pool
+        self.pending_requests = bridge_pool.pending_requests
+        if target_endpoint:
+            bridge_pool.add_direct_endpoint(target_agent_address, target_endpoint)
+        bridge_pool.add_target(target_agent_address)
+        logger.info(f"Target Agentverse agent: {self.target_agent_address}")
+
+    @property
+    def bridge_running(self) -> bool:
+        return self.bridge_pool.running
 
     async def execute(
         self,
@@ -161,6 +108,52 @@ class AgentverseAgentExecutor(AgentExecutor):
         if error:
             raise ServerError(error=InvalidParamsError())
         
+        # The deadline covers the whole request, including time spent
+        # waiting for an admission slot
+        deadline = time.time() + self._request_timeout(context)
+        started = time.monotonic()
+        cache_key = self._cache_key(context)
+        fetch = None
+        
+        # Wait for a free slot before any work starts, or reject right away
+        # with a retry hint when the server is overloaded
+        try:
+            if cache_key is not None:
+                # Cached answers, and answers to an identical query already
+                # in flight, need neither a slot nor the bridge
+                answer = self.response_cache.get(cache_key) or await self.response_cache.wait(
+                    cache_key, deadline - time.time()
+                )
+                if answer is not None:
+                    await self._execute(context, event_queue, deadline, answer=answer)
+                    return
+                # In flight from here on, so identical queries queued behind
+                # this one for a slot wait for its answer too
+                fetch = self.response_cache.begin(cache_key)
+                if fetch is None:
+                    cache_key = None
+            async with self.admission.admit(self.target_agent_address, context.context_id,
+                                            timeout=deadline - time.time()):
+                await self._execute(context, event_queue, deadline, cache_key)
+        except AdmissionTimeoutError as e:
+            # The deadline passed while queued; end the task as timed out
+            logger.warning(f"Request for {self.target_agent_address} timed out: {e}")
+            self.bridge_pool.metrics.timeouts.inc()
+            await self._execute(context, event_queue, deadline, answer=self._timeout_item())
+        except AdmissionRejectedError as e:
+            logger.warning(f"Rejected request for {self.target_agent_address}: {e}")
+            raise ServerError(error=InternalError(
+                message=f"{e}; retry after {e.retry_after}s",
+                data={'retryAfter': e.retry_after},
+            )) from e
+        finally:
+            if fetch is not None and not fetch.done():
+                # Rejected, failed, canceled or waiting for input: nothing to share
+                self.response_cache.finish(cache_key)
+            self.bridge_pool.metrics.request_duration.observe(time.monotonic() - started)
+
+    async def _execute(self, context: RequestContext, event_queue: EventQueue, deadline: float,
+                       cache_key: Optional[CacheKey] = None, answer: Optional[Dict] = None) -> None:
         query = context.get_user_input()
         task = context.current_task
         
@@ -169,30 +162,53 @@ class AgentverseAgentExecutor(AgentExecutor):
             await event_queue.enqueue_event(task)
         
         updater = TaskUpdater(event_queue, task.id, task.contextId)
+        if answer is not None:
+            items = self._replay(answer)
+        elif cache_key is not None:
+            items = self._cached_stream(query, task.contextId, task.id, deadline, cache_key)
+        else:
+            items = self._stream_via_agentverse(query, task.contextId, task.id, deadline)
         
         try:
-            logger.info("Starting async iteration over Agentverse bridge responses")
-            async for item in self._stream_via_agentverse(query, task.contextId):
-                logger.info(f"Received item from bridge: {item}")
+            logger.debug("Starting async iteration over Agentverse bridge responses")
+            async for item in items:
+                logger.debug("Received item from bridge: %s", item)
                 is_task_complete = item['is_task_complete']
                 require_user_input = item['require_user_input']
                 
-                if not is_task_complete and not require_user_input:
-                    logger.info("Updating status to working")
+                parts = [
+                    Part(root=TextPart(text=text))
+                    for text in item.get('parts') or [item['content']]
+                ]
+                
+                if item.get('is_error'):
+                    logger.debug("Updating status to failed")
+                    await updater.update_status(
+                        TaskState.failed,
+                        new_agent_parts_message(
+                            parts,
+                            task.contextId,
+                            task.id,
+                        ),
+                        final=True,
+                    )
+                    break
+                elif not is_task_complete and not require_user_input:
+                    logger.debug("Updating status to working")
                     await updater.update_status(
                         TaskState.working,
-                        new_agent_text_message(
-                            item['content'],
+                        new_agent_parts_message(
+                            parts,
                             task.contextId,
                             task.id,
                         ),
                     )
                 elif require_user_input:
-                    logger.info("Updating status to input_required")
+                    logger.debug("Updating status to input_required")
                     await updater.update_status(
                         TaskState.input_required,
-                        new_agent_text_message(
-                            item['content'],
+                        new_agent_parts_message(
+                            parts,
                             task.contextId,
                             task.id,
                         ),
@@ -200,98 +216,176 @@ class AgentverseAgentExecutor(AgentExecutor):
                     )
                     break
                 else:
-                    logger.info("Adding artifact and completing task")
+                    logger.debug("Adding artifact and completing task")
                     await updater.add_artifact(
-                        [Part(root=TextPart(text=item['content']))],
+                        parts,
                         name='agentverse_result',
                     )
                     await updater.complete()
-                    logger.info("Task completed successfully")
+                    logger.debug("Task %s completed successfully", task.id)
                     break
-            logger.info("Finished async iteration")
+            logger.debug("Finished async iteration")
         except Exception as e:
             logger.error(f'An error occurred while streaming the response: {e}')
             raise ServerError(error=InternalError()) from e
 
-    async def _stream_via_agentverse(self, query: str, context_id: str):
+    async def _stream_via_agentverse(self, query: str, context_id: str, task_id: Optional[str] = None,
+                                     deadline: Optional[float] = None):
         """
         Bridge method that communicates with Agentverse agent via chat protocol.
         Maintains same interface as direct agent execution.
+        
+        Every chat message the target sends for this request is yielded as it
+        arrives. The stream ends on a message the target marks as final (an
+        end-of-session marker or a final flag), or once the target has been
+        quiet for ``stream_quiet_period`` seconds after a partial message.
+        If ``deadline`` (a ``time.time()`` value, default ``response_timeout``
+        from now) passes first, the stream ends with an error item. A
+        canceled request ends the stream without an item.
         """
         try:
-            logger.info(f"Processing query via Agentverse bridge: {query}")
+            logger.debug("Processing query via Agentverse bridge: %s", query)
+            if deadline is None:
+                deadline = time.time() + self.response_timeout
             
-            # Send working status first
-            yield {
-                'is_task_complete': False,
-                'require_user_input': False,
-                'content': 'Connecting to Agentverse agent...'
-            }
+            # Queue the request on the least busy bridge worker; the bridge
+            # puts each reply on the queue as soon as it arrives
+            request_id, replies = self.bridge_pool.submit(
+                self.target_agent_address, query, context_id, deadline
+            )
+            if task_id is not None:
+                self._requests_by_task[task_id] = request_id
             
-            # Create unique request ID
-            request_id = f"req_{context_id}_{int(time.time())}"
-            
-            # Add request to pending queue
-            self.pending_requests[request_id] = {
-                'query': query,
-                'contextId': context_id,
-                'sent': False,
-                'target': None
-            }
-            
-            # Wait for response with timeout
-            timeout = 120  # 2 minutes timeout
-            wait_count = 0
-            
-            while request_id not in self.response_cache and wait_count < timeout:
-                await asyncio.sleep(0.5)
-                wait_count += 1
-            
-            if request_id in self.response_cache:
-                response = self.response_cache.pop(request_id)
-                logger.info(f"Successfully received response from Agentverse agent")
-                
-                # Check if response indicates need for more input
-                if any(phrase in response.lower() for phrase in [
-                    "need more", "specify", "unclear", "provide more details", 
-                    "can you provide", "please provide", "which", "what", "how"
-                ]):
-                    logger.info("Yielding input_required response")
+            # The entry is always released so abandoned or cancelled waiters
+            # do not leak
+            try:
+                last_reply = None
+                while True:
+                    timeout = deadline - time.time()
+                    if last_reply is not None:
+                        timeout = min(timeout, self.stream_quiet_period)
+                    try:
+                        reply = await asyncio.wait_for(replies.get(), timeout=timeout)
+                    except asyncio.TimeoutError:
+                        reply = None
+                    
+                    if isinstance(reply, Exception):
+                        raise reply
+                    
+                    if reply is None and (last_reply is None or time.time() >= deadline):
+                        # Deadline passed before the target finished
+                        logger.error("Agentverse communication timed out")
+                        self.bridge_pool.metrics.timeouts.inc()
+                        yield self._timeout_item()
+                        return
+                    
+                    if reply is None:
+                        logger.warning(
+                            f"No reply from {self.target_agent_address} for {self.stream_quiet_period}s "
+                            f"after a partial one; taking it as the answer"
+                        )
+                    if reply is None or reply['final']:
+                        # Quiet period elapsed after a partial message, or
+                        # the target marked this message as its last one
+                        final_item = self._final_item(reply or last_reply)
+                        # Only an answer the target ended itself is whole;
+                        # the quiet-period fallback may be cut short
+                        final_item['final'] = reply is not None
+                        logger.debug("Successfully received response from Agentverse agent")
+                        yield final_item
+                        return  # Explicitly return to end the generator
+                    
+                    # Partial message: forward it as progress right away
+                    last_reply = reply
                     yield {
                         'is_task_complete': False,
-                        'require_user_input': True,
-                        'content': response
-                    }
-                else:
-                    # Successful completion
-                    logger.info("Yielding completed response")
-                    yield {
-                        'is_task_complete': True,
                         'require_user_input': False,
-                        'content': response
+                        'content': ''.join(reply['parts']),
+                        'parts': reply['parts']
                     }
-                logger.info("Response yielded successfully")
-                return  # Explicitly return to end the generator
-            else:
-                # Timeout occurred
-                logger.error("Agentverse communication timed out")
-                # Clean up pending request
-                if request_id in self.pending_requests:
-                    del self.pending_requests[request_id]
-                yield {
-                    'is_task_complete': False,
-                    'require_user_input': True,
-                    'content': 'Request timed out. Please try again.'
-                }
+            finally:
+                if task_id is not None:
+                    self._requests_by_task.pop(task_id, None)
+                self.bridge_pool.release(request_id)
                 
+        except RequestCanceledError:
+            # cancel() has already reported the task as canceled
+            logger.info(f"Request for task {task_id} canceled")
         except Exception as e:
             logger.error(f"Error in Agentverse bridge communication: {e}")
             yield {
                 'is_task_complete': False,
-                'require_user_input': True,
+                'require_user_input': False,
+                'is_error': True,
                 'content': f'Error communicating with Agentverse agent: {str(e)}'
             }
 
+    async def _replay(self, answer: Dict):
+        yield answer
+
+    async def _cached_stream(self, query: str, context_id: str, task_id: Optional[str], deadline: float,
+                             cache_key: CacheKey):
+        """
+        ``_stream_via_agentverse``, storing a completed answer in the response
+        cache and handing it to identical queries waiting for it.
+
+        Only answers that ended with the target's final message are stored,
+        not the last progress message of a target that went quiet.
+        ``execute`` has marked ``cache_key`` in flight and ends the fetch
+        itself if no completed answer comes.
+        """
+        async for item in self._stream_via_agentverse(query, context_id, task_id, deadline):
+            if item.get('final') and item['is_task_complete'] and not item.get('is_error'):
+                self.response_cache.finish(cache_key, item)
+            yield item
+
+    def _cache_key(self, context: RequestContext) -> Optional[CacheKey]:
+        """Response cache key for this request, or None if it must not be cached."""
+        if self.response_cache is None or context.current_task is not None:
+            # Replies to a running task depend on that task's conversation
+            return None
+        metadata = (context.message.metadata if context.message else None) or {}
+        if str(metadata.get('no_cache', '')).lower() in ('true', '1', 'yes'):
+            return None
+        return self.response_cache.key(self.target_agent_address, context.get_user_input())
+
+    @staticmethod
+    def _timeout_item():
+        return {
+            'is_task_complete': False,
+            'require_user_input': False,
+            'is_error': True,
+            'content': 'Request timed out. Please try again.'
+        }
+
+    def _final_item(self, reply):
+        """Turn the target's last message into a completed, input_required or error item."""
+        parts = reply['parts']
+        response = ''.join(parts)
+        status = self.status_classifier.classify(response, reply.get('metadata'))
+        logger.debug("Yielding %s response", status)
+        return {
+            'is_task_complete': status not in (INPUT_REQUIRED, ERROR),
+            'require_user_input': status == INPUT_REQUIRED,
+            'is_error': status == ERROR,
+            'content': response,
+            'parts': parts
+        }
+
+    def _request_timeout(self, context: RequestContext) -> float:
+        """Seconds this request may take: the caller's ``timeout`` metadata, capped at ``response_timeout``."""
+        metadata = (context.message.metadata if context.message else None) or {}
+        requested = metadata.get('timeout')
+        if requested is None:
+            return self.response_timeout
+        try:
+            timeout = float(requested)
+        except (TypeError, ValueError):
+            timeout = 0.0
+        if not timeout > 0:
+            raise ServerError(error=InvalidParamsError(message=f"Invalid timeout: {requested!r}"))
+        return min(timeout, self.response_timeout)
+
     def _validate_request(self, context: RequestContext) -> bool:
         """Validate the incoming request."""
         return False
@@ -299,5 +393,22 @@ class AgentverseAgentExecutor(AgentExecutor):
     async def cancel(
         self, context: RequestContext, event_queue: EventQueue
     ) -> None:
-        """Cancel operation - not supported."""
-        raise ServerError(error=UnsupportedOperationError())
\ No newline at end of file
+        """
+        Cancel a running task.
+
+        The task's pending bridge request is dropped at once, which ends the
+        coroutine waiting for its reply, and, if cancel notices are on, the
+        target agent is sent one. The task is then marked canceled.
+        """
+        task = context.current_task
+        if not task:
+            raise ServerError(error=TaskNotFoundError())
+        if task.status.state in TERMINAL_STATES:
+            raise ServerError(error=TaskNotCancelableError())
+
+        request_id = self._requests_by_task.pop(task.id, None)
+        if request_id is not None and self.bridge_pool.cancel(request_id, notify=self.cancel_notice):
+            logger.info(f"Canceled request {request_id} for task {task.id}")
+
+        updater = TaskUpdater(event_queue, task.id, task.contextId)
+        await updater.update_status(TaskState.canceled, final=True)
\ No newline at end of file
@@ -0,0 +1,680 @@
+"""Pool of uAgent bridge identities that carry A2A requests to target agents."""
+
+import asyncio
+import logging
+import re
+import threading
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+from uuid import NAMESPACE_URL, UUID, uuid4, uuid5
+
+from uagents import Agent, Context, Protocol
+from uagents_core.contrib.protocols.chat import (
+    ChatMessage,
+    ChatAcknowledgement,
+    EndSessionContent,
+    MetadataContent,
+    TextContent,
+    chat_protocol_spec
+)
+
+from .direct_transport import CachedResolver, DirectEndpointResolver
+from .metrics import BridgeMetrics
+from .pending_requests import PendingRequestStore, RequestCanceledError, RequestExpiredError
+
+logger = logging.getLogger(__name__)
+
+# Context tag prefixed to outgoing queries with ``context_in_text``; targets may echo it back
+USER_CONTEXT_PATTERN = re.compile(r"\[USER_CONTEXT:([^\]]+)\]")
+
+
+def session_id_for(context_id: str) -> str:
+    """
+    Stable uAgent session id for an A2A context, the same from every bridge worker.
+
+    Derived from the context id by name, then marked as version 4, since
+    uAgents only accepts version 4 UUIDs as envelope sessions.
+    """
+    return str(UUID(bytes=uuid5(NAMESPACE_URL, f"a2a-context:{context_id}").bytes, version=4))
+
+
+class BridgeWorker:
+    """
+    One bridge uAgent identity with its own mailbox and port.
+
+    Requests are pushed onto an outbound queue owned by the worker's loop and
+    sent by a dispatcher task; replies are correlated through the pool's
+    shared ``PendingRequestStore``.
+
+    In thread mode the agent runs on its own loop in a background thread. In
+    integrated mode it runs as tasks on the caller's loop (the A2A server's),
+    so handing a request over is a plain queue put.
+    """
+
+    # Consecutive send failures after which the worker is taken out of rotation
+    MAX_CONSECUTIVE_FAILURES = 3
+    # Seconds before an unhealthy worker is offered traffic again
+    RETRY_UNHEALTHY_AFTER = 30.0
+    # Seconds the agent's shutdown handlers may take in integrated mode
+    SHUTDOWN_TIMEOUT = 5.0
+
+    def __init__(self, name: str, port: int, seed: str, pending_requests: PendingRequestStore,
+                 integrated: bool = False, metrics: Optional[BridgeMetrics] = None,
+                 agent_options: Optional[Dict[str, Any]] = None, context_in_text: bool = False):
+        """
+        Args:
+            name: Name of the bridge agent
+            port: Port for the bridge agent
+            seed: Seed phrase that determines the bridge agent's address
+            pending_requests: Store shared by all workers of the pool
+            integrated: Run on the loop that calls ``start_async`` instead of a thread
+            metrics: Latency metrics shared by all workers of the pool (default: BridgeMetrics())
+            agent_options: Extra keyword arguments for the bridge ``Agent``, e.g.
+                ``{"mailbox": False, "resolve": resolver}`` to reach local agents
+            context_in_text: Also prefix queries with ``[USER_CONTEXT:<context id>]``
+                for targets that read the context from the text (default: False)
+        """
+        self.name = name
+        self.port = port
+        self.seed = seed
+        self.pending_requests = pending_requests
+        self.integrated = integrated
+        self.metrics = metrics or BridgeMetrics()
+        self.agent_options = agent_options or {}
+        self.context_in_text = context_in_text
+        self.running = False
+        self.in_flight = 0
+        self.sent = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.last_error: Optional[str] = None
+        self.last_failure_at = 0.0
+        self.agent: Optional[Agent] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._outbound: Optional[asyncio.Queue] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._agent_task: Optional[asyncio.Task] = None
+        # Background tasks the agent's setup() started, in integrated mode
+        self._agent_tasks: List[asyncio.Task] = []
+        self._ready: Optional[asyncio.Event] = None
+
+        # In thread mode each worker gets its own loop so several agents can
+        # run side by side; integrated workers bind to the server loop later
+        if not integrated:
+            self._build_agent(asyncio.new_event_loop())
+
+    @property
+    def address(self) -> Optional[str]:
+        return self.agent.address if self.agent is not None else None
+
+    def _build_agent(self, loop: asyncio.AbstractEventLoop):
+        """Create the bridge agent on ``loop`` and register its handlers."""
+        self._loop = loop
+        # Create bridge agent with mailbox to communicate via Agentverse
+        options = dict(
+            name=self.name,
+            port=self.port,
+            seed=self.seed,
+            mailbox=True,  # Enable mailbox for Agentverse communication
+            loop=loop,
+        )
+        options.update(self.agent_options)
+        self.agent = Agent(**options)
+        self.chat_proto = Protocol(spec=chat_protocol_spec)
+        self._setup()
+
+    @property
+    def healthy(self) -> bool:
+        """Whether the worker should receive new requests."""
+        if not self.running:
+            return False
+        if self.consecutive_failures < self.MAX_CONSECUTIVE_FAILURES:
+            return True
+        # Give a failing worker another chance once it has rested
+        return time.monotonic() - self.last_failure_at > self.RETRY_UNHEALTHY_AFTER
+
+    def _setup(self):
+        """Setup bridge agent message handlers."""
+
+        @self.agent.on_event("startup")
+        async def bridge_startup(ctx: Context):
+            # Outbound requests are pushed onto a queue owned by this loop
+            # and sent by a dispatcher task as soon as they arrive
+            self._outbound = asyncio.Queue()
+            self._dispatcher = asyncio.create_task(self._dispatch_outbound())
+            self.running = True
+            if self._ready is not None:
+                self._ready.set()
+            logger.info(f"A2A Bridge agent {self.name} started with address: {ctx.agent.address}")
+
+        @self.chat_proto.on_message(ChatMessage)
+        async def handle_chat_response(ctx: Context, sender: str, msg: ChatMessage):
+            """Handle chat message responses from target agent."""
+            # Extract text parts, correlation metadata and end marker from chat message
+            parts = []
+            metadata = {}
+            end_of_session = False
+            for content in msg.content:
+                if isinstance(content, TextContent):
+                    parts.append(content.text)
+                elif isinstance(content, MetadataContent):
+                    metadata.update(content.metadata)
+                elif isinstance(content, EndSessionContent):
+                    end_of_session = True
+            response_text = "".join(parts)
+
+            # Route the reply to its waiter: echoed msg_id first, then the
+            # A2A context id, then the oldest request sent to this agent
+            context_id = metadata.get('context_id')
+            if not context_id:
+                context_match = USER_CONTEXT_PATTERN.search(response_text)
+                context_id = context_match.group(1) if context_match else None
+            request_id = self.pending_requests.match(
+                sender,
+                in_reply_to=metadata.get('in_reply_to'),
+                context_id=context_id,
+            )
+
+            # An end-of-session marker or final flag closes the stream; a
+            # message without either is left to the store to decide
+            if end_of_session:
+                final = True
+            elif 'final' in metadata:
+                final = metadata['final'].lower() == 'true'
+            else:
+                final = None
+
+            reply = {'parts': parts, 'metadata': metadata}
+            request_info = self.pending_requests.get(request_id) if request_id is not None else None
+            # Read before delivering, which marks the request as streaming
+            first_reply = request_info is not None and not request_info['streaming']
+            if request_info is not None and self.pending_requests.deliver(request_id, reply, final):
+                if first_reply and request_info['sent_at'] is not None:
+                    self.metrics.send_to_reply.observe(time.monotonic() - request_info['sent_at'])
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Received chat response from %s: %s...", sender, response_text[:100])
+                    if 'seq' in metadata:
+                        logger.debug(
+                            "Stream message %s (%s) for %s after %sms", metadata['seq'],
+                            metadata.get('stage', ''), request_id, metadata.get('elapsed_ms', '?'),
+                        )
+            else:
+                logger.warning(f"Dropping chat response from {sender} with no pending request")
+
+            # Send acknowledgment
+            ack_msg = ChatAcknowledgement(
+                timestamp=datetime.now(timezone.utc),
+                acknowledged_msg_id=msg.msg_id
+            )
+            await ctx.send(sender, ack_msg)
+
+        @self.chat_proto.on_message(ChatAcknowledgement)
+        async def handle_chat_ack(ctx: Context, sender: str, msg: ChatAcknowledgement):
+            """Handle chat acknowledgments."""
+            logger.debug("Chat message acknowledged by %s", sender)
+
+        # Include chat protocol
+        self.agent.include(self.chat_proto)
+
+    async def _dispatch_outbound(self):
+        """Send queued requests to their target agent; idles until one arrives."""
+        while True:
+            request_id, target, notice = await self._outbound.get()
+            if notice is not None:
+                await self._send_notice(target, notice)
+                continue
+            request_info = self.pending_requests.get(request_id)
+            if request_info is None:
+                # Timed out before it could be sent
+                continue
+            deadline = request_info['deadline']
+            if deadline is not None and time.time() >= deadline:
+                # The caller has stopped waiting; spare the target the work
+                self.metrics.timeouts.inc()
+                self.pending_requests.fail(request_id, RequestExpiredError("Deadline passed before the request was sent"))
+                continue
+            self.metrics.queue_wait.observe(time.monotonic() - request_info['created'])
+            try:
+                await self._send_request(request_id, request_info, target)
+            except Exception as e:
+                self._record_failure(e)
+                logger.error(f"Bridge {self.name} failed to send chat message to {target}: {e}")
+                self.pending_requests.fail(request_id, e)
+            else:
+                self.sent += 1
+                self.consecutive_failures = 0
+
+    async def _send_request(self, request_id: str, request_info: Dict[str, Any], target: str):
+        """Send one pending request to the target agent as a chat message."""
+        # The A2A context travels as metadata, not in the text, and as the
+        # message's uAgent session: targets key their conversation state on
+        # session_id (or ctx.session), which stays the same for every turn
+        context_id = request_info['contextId']
+        query = request_info['query']
+        if self.context_in_text:
+            # Format: [USER_CONTEXT:context_id] actual_query
+            query = f"[USER_CONTEXT:{context_id}] {query}"
+        metadata = {'context_id': context_id, 'session_id': session_id_for(context_id), 'stream': 'true'}
+        if request_info['deadline'] is not None:
+            # Unix time after which the reply is no longer wanted, so the
+            # target can drop expired work
+            metadata['deadline'] = f"{request_info['deadline']:.3f}"
+
+        # Targets echo msg_id as in_reply_to so the reply can be correlated
+        chat_msg = ChatMessage(
+            timestamp=datetime.now(timezone.utc),
+            msg_id=uuid4(),
+            content=[
+                TextContent(type="text", text=query),
+                # Ask targets that support it to stream progress messages
+                MetadataContent(type="metadata", metadata=metadata),
+            ]
+        )
+
+        # Index before sending so a fast reply cannot miss its waiter
+        self.pending_requests.mark_sent(request_id, str(chat_msg.msg_id), target)
+        status = await self._session_context(context_id).send(target, chat_msg)
+        if getattr(status, 'status', None) == "failed":
+            raise RuntimeError(getattr(status, 'detail', None) or "message delivery failed")
+        logger.debug("Bridge %s sent chat message to %s", self.name, target)
+
+    async def _send_notice(self, target: str, metadata: Dict[str, str]):
+        """Send a metadata-only chat message, such as a cancel notice; best effort."""
+        chat_msg = ChatMessage(
+            timestamp=datetime.now(timezone.utc),
+            msg_id=uuid4(),
+            content=[MetadataContent(type="metadata", metadata=metadata)],
+        )
+        try:
+            await self._session_context(metadata.get('context_id')).send(target, chat_msg)
+        except Exception as e:
+            logger.warning(f"Bridge {self.name} failed to send notice to {target}: {e}")
+
+    def _session_context(self, context_id: Optional[str]) -> Context:
+        """
+        Context to send with, in the uAgent session of the A2A context.
+
+        The agent's startup context keeps one session for its lifetime, which
+        would put every conversation in the same session; a context per send
+        carries ``session_id_for(context_id)`` as its session instead, so the
+        target sees the same ``ctx.session`` on every turn of a conversation.
+        """
+        ctx = self.agent._build_context()
+        if context_id:
+            ctx._session = UUID(session_id_for(context_id))
+        return ctx
+
+    def _record_failure(self, error: Exception):
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.last_error = str(error)
+        self.last_failure_at = time.monotonic()
+
+    def submit(self, request_id: str, target: str):
+        """Hand a request to the dispatcher from any thread."""
+        self._enqueue((request_id, target, None))
+
+    def submit_notice(self, target: str, metadata: Dict[str, str]):
+        """Hand a metadata-only message for ``target`` to the dispatcher from any thread."""
+        self._enqueue((None, target, metadata))
+
+    def _enqueue(self, item: Tuple[Optional[str], str, Optional[Dict[str, str]]]):
+        if self.integrated:
+            self._outbound.put_nowait(item)
+        else:
+            self._loop.call_soon_threadsafe(self._outbound.put_nowait, item)
+
+    def start(self):
+        """Run the bridge agent on a background thread."""
+        def run_bridge():
+            asyncio.set_event_loop(self._loop)
+            self.agent.run()
+
+        thread = threading.Thread(target=run_bridge, name=f"bridge-{self.name}", daemon=True)
+        thread.start()
+
+    async def start_async(self):
+        """
+        Run the bridge agent as tasks on the running loop; returns once they are scheduled.
+
+        ``Agent.run_async`` is not used: when it exits it cancels every task
+        on the loop, the A2A server's included. The agent's own tasks are
+        tracked instead, and ``stop_async`` cancels only those.
+        """
+        loop = asyncio.get_running_loop()
+        if self.agent is None:
+            self._build_agent(loop)
+        self._ready = asyncio.Event()
+        existing = asyncio.all_tasks(loop)
+        # Schedules the message dispenser and receivers, registration and the
+        # startup handlers; the bridge registers no interval handlers
+        self.agent.setup()
+        self._agent_tasks = list(asyncio.all_tasks(loop) - existing)
+        self._agent_task = asyncio.create_task(self._serve_agent())
+
+    async def _serve_agent(self):
+        """Run the agent's server and mailbox client, as ``Agent.run_async`` does; their errors propagate."""
+        agent = self.agent
+        serving = []
+        # A mailbox agent without REST handlers needs no server of its own
+        if agent.mailbox_client is None or agent._rest_handlers:
+            serving.append(agent.start_server())
+        if agent.mailbox_client is not None:
+            serving.append(agent.mailbox_client.run())
+        await asyncio.gather(*serving)
+
+    async def wait_ready(self):
+        """Wait until the agent's startup handler has run."""
+        ready = asyncio.create_task(self._ready.wait())
+        done, _ = await asyncio.wait({ready, self._agent_task}, return_when=asyncio.FIRST_COMPLETED)
+        if ready not in done:
+            ready.cancel()
+            # The agent exited before starting; surface its error
+            self._agent_task.result()
+            raise RuntimeError(f"A2A bridge {self.name} stopped during startup")
+
+    async def stop_async(self):
+        """Stop the dispatcher and the agent tasks started by ``start_async``, then run its shutdown handlers."""
+        started = self.running
+        self.running = False
+        tasks = [task for task in (self._dispatcher, self._agent_task, *self._agent_tasks) if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if started:
+            # Also marks the agent inactive in the almanac, which must not hold up the server's exit
+            try:
+                await asyncio.wait_for(self.agent._shutdown(), timeout=self.SHUTDOWN_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.warning(f"A2A bridge {self.name} shutdown handlers did not finish")
+        self._dispatcher = None
+        self._agent_task = None
+        self._agent_tasks = []
+
+    def health(self) -> Dict[str, Any]:
+        """Return a health snapshot of this worker."""
+        return {
+            'name': self.name,
+            'address': self.address,
+            'port': self.port,
+            'running': self.running,
+            'healthy': self.healthy,
+            'in_flight': self.in_flight,
+            'sent': self.sent,
+            'failures': self.failures,
+            'last_error': self.last_error,
+        }
+
+
+class BridgePool:
+    """
+    N bridge uAgents on distinct ports and seeds behind one A2A server.
+
+    Requests go to the healthy worker with the fewest requests in flight, so
+    throughput is not capped by a single mailbox identity. The first worker
+    keeps the single-bridge name, seed and port so existing deployments keep
+    their bridge address.
+
+    Thread mode (``start``) runs every agent on its own background thread.
+    Integrated mode runs them on the A2A server's loop, started and stopped
+    by the app lifespan (``lifespan``), so no handoff crosses threads.
+
+    Targets running on the same host or LAN can be given a local endpoint
+    (``add_direct_endpoint``); messages then skip the Agentverse mailbox
+    unless that endpoint is unreachable.
+
+    Almanac lookups are cached for ``resolve_ttl`` seconds and refreshed in
+    the background. Known targets (``add_target``) are resolved when the pool
+    starts, so their first request does not wait for the almanac.
+    """
+
+    def __init__(self, bridge_name: str = "a2a_bridge", bridge_port: int = 8082, workers: int = 1,
+                 max_pending_requests: int = 10000, request_ttl: float = 150.0,
+                 integrated: bool = False, startup_timeout: float = 10.0,
+                 agent_options: Optional[Dict[str, Any]] = None,
+                 direct_endpoints: Optional[Dict[str, str]] = None, resolve_ttl: float = 300.0,
+                 context_in_text: bool = False, cancel_notice: bool = False):
+        """
+        Args:
+            bridge_name: Base name for the bridge agents (default: "a2a_bridge")
+            bridge_port: Port of the first bridge agent; worker i uses port + i (default: 8082)
+            workers: Number of bridge agents (default: 1)
+            max_pending_requests: Maximum number of in-flight requests kept (default: 10000)
+            request_ttl: Seconds after which an unanswered request is evicted (default: 150)
+            integrated: Run the agents on the A2A server's loop via ``lifespan`` (default: False)
+            startup_timeout: Seconds to wait for the agents to come up (default: 10)
+            agent_options: Extra keyword arguments for every bridge ``Agent``
+            direct_endpoints: Local endpoint per target address; messages go
+                there first and fall back to the mailbox (see ``add_direct_endpoint``)
+            resolve_ttl: Seconds an almanac lookup is used before it is refreshed (default: 300)
+            context_in_text: Also prefix queries with ``[USER_CONTEXT:<context id>]``
+                for targets that predate the ``context_id`` metadata (default: False)
+            cancel_notice: Send the target a metadata-only chat message naming a
+                canceled request (see ``cancel``); targets that do not expect it
+                may take it for a new turn (default: False)
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.integrated = integrated
+        self.startup_timeout = startup_timeout
+        self.cancel_notice = cancel_notice
+        self.metrics = BridgeMetrics()
+        # Every bridge agent resolves targets through this, so endpoints
+        # added later apply to running agents too
+        self.resolve_cache = CachedResolver(ttl=resolve_ttl, latency=self.metrics.resolve_latency)
+        self.resolver = DirectEndpointResolver(direct_endpoints, fallback=self.resolve_cache)
+        # Agents given their own resolver have nothing to prefetch
+        self._prefetch = 'resolve' not in (agent_options or {})
+        agent_options = dict({'resolve': self.resolver}, **(agent_options or {}))
+        self.targets: Set[str] = set()
+        self.pending_requests = PendingRequestStore(
+            max_size=max_pending_requests,
+            ttl=request_ttl,
+            thread_safe=not integrated,
+        )
+        self.workers: List[BridgeWorker] = []
+        for index in range(workers):
+            name = bridge_name if index == 0 else f"{bridge_name}_{index}"
+            self.workers.append(BridgeWorker(
+                name=name,
+                port=bridge_port + index,
+                seed=f"{name}_seed",
+                pending_requests=self.pending_requests,
+                integrated=integrated,
+                metrics=self.metrics,
+                agent_options=agent_options,
+                context_in_text=context_in_text,
+            ))
+        self._assignments: Dict[str, BridgeWorker] = {}
+        self._started = False
+
+    @property
+    def running(self) -> bool:
+        return any(worker.running for worker in self.workers)
+
+    def start(self, timeout: Optional[float] = None) -> bool:
+        """
+        Start every bridge agent and wait for them to come up.
+
+        Args:
+            timeout: Seconds to wait (default: ``startup_timeout``)
+
+        Returns:
+            True if all workers started within ``timeout`` seconds
+        """
+        if self.integrated:
+            raise RuntimeError("Integrated bridge pools are started by the app lifespan")
+        if self._started:
+            return all(worker.running for worker in self.workers)
+        self._started = True
+        for worker in self.workers:
+            worker.start()
+
+        # Wait for bridges to start
+        deadline = time.monotonic() + (self.startup_timeout if timeout is None else timeout)
+        while not all(worker.running for worker in self.workers) and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+        started = self._log_started()
+        loop = self._running_loop()
+        if loop is not None and self._prefetch and self.targets:
+            try:
+                asyncio.run_coroutine_threadsafe(
+                    self.resolver.prefetch(list(self.targets)), loop
+                ).result(timeout=max(0.0, deadline - time.monotonic()))
+            except Exception as e:
+                logger.warning(f"Resolving targets at startup did not finish: {e}")
+        return started
+
+    def _log_started(self) -> bool:
+        for worker in self.workers:
+            if worker.running:
+                logger.info(f"✅ A2A Bridge {worker.name} to Agentverse started successfully (port {worker.port})")
+            else:
+                logger.error(f"❌ Failed to start A2A bridge {worker.name} (port {worker.port})")
+        return all(worker.running for worker in self.workers)
+
+    async def start_async(self, timeout: Optional[float] = None) -> bool:
+        """
+        Start every bridge agent on the running loop and wait for their startup.
+
+        Args:
+            timeout: Seconds to wait (default: ``startup_timeout``)
+
+        Returns:
+            True if all workers started within ``timeout`` seconds
+        """
+        for worker in self.workers:
+            await worker.start_async()
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(worker.wait_ready() for worker in self.workers)),
+                timeout=self.startup_timeout if timeout is None else timeout,
+            )
+        except Exception as e:
+            logger.error(f"A2A bridge startup failed: {e}")
+        if self._prefetch and self.targets:
+            try:
+                await asyncio.wait_for(self.resolver.prefetch(list(self.targets)), timeout=self.startup_timeout)
+            except Exception as e:
+                logger.warning(f"Resolving targets at startup did not finish: {e}")
+        return self._log_started()
+
+    async def stop_async(self):
+        """Stop every bridge agent started with ``start_async``."""
+        await asyncio.gather(*(worker.stop_async() for worker in self.workers))
+        logger.info("A2A bridge stopped")
+
+    @asynccontextmanager
+    async def lifespan(self, app):
+        """
+        Starlette lifespan that runs the bridge agents alongside the app.
+
+        Raises:
+            RuntimeError: A bridge agent did not start within ``startup_timeout``,
+                so the server fails to start instead of taking traffic
+        """
+        if not await self.start_async():
+            await self.stop_async()
+            raise RuntimeError("A2A bridge did not start; see the errors above")
+        try:
+            yield
+        finally:
+            await self.stop_async()
+
+    def add_direct_endpoint(self, address: str, endpoint: str):
+        """Deliver messages for ``address`` to its local ``endpoint``, with the mailbox as fallback."""
+        self.resolver.add(address, endpoint)
+
+    def add_target(self, address: str):
+        """
+        Resolve ``address`` ahead of its first request.
+
+        Targets added before the pool starts are resolved during startup;
+        later ones are resolved in the background on a bridge loop.
+        """
+        if address in self.targets:
+            return
+        self.targets.add(address)
+        loop = self._running_loop()
+        if loop is not None and self._prefetch:
+            asyncio.run_coroutine_threadsafe(self.resolver.prefetch([address]), loop)
+
+    def _running_loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        for worker in self.workers:
+            if worker.running and worker._loop is not None and worker._loop.is_running():
+                return worker._loop
+        return None
+
+    def _pick_worker(self) -> BridgeWorker:
+        candidates = [worker for worker in self.workers if worker.healthy]
+        if not candidates:
+            candidates = [worker for worker in self.workers if worker.running]
+        if not candidates:
+            raise RuntimeError("A2A bridge agent is not running")
+        return min(candidates, key=lambda worker: worker.in_flight)
+
+    def submit(self, target: str, query: str, context_id: str,
+               deadline: Optional[float] = None) -> Tuple[str, asyncio.Queue]:
+        """
+        Queue a query for ``target`` on the least busy healthy worker.
+
+        Must be called from the loop that is going to read the queue, and
+        paired with ``release`` once the caller stops waiting. A ``deadline``
+        (``time.time()`` value) is sent to the target, and the request is
+        dropped unsent if it passes while the request is still queued.
+
+        Returns:
+            The request id and the queue its replies will be put on, as
+            returned by ``PendingRequestStore.add``
+        """
+        worker = self._pick_worker()
+        request_id, replies = self.pending_requests.add(query, context_id, deadline)
+        worker.in_flight += 1
+        self._assignments[request_id] = worker
+        try:
+            worker.submit(request_id, target)
+        except Exception:
+            self.release(request_id)
+            raise
+        return request_id, replies
+
+    def release(self, request_id: str):
+        """Forget a request once its caller has stopped waiting for it."""
+        self.pending_requests.remove(request_id)
+        worker = self._assignments.pop(request_id, None)
+        if worker is not None:
+            worker.in_flight -= 1
+
+    def cancel(self, request_id: str, notify: Optional[bool] = None) -> bool:
+        """
+        Cancel a request: its entry is removed at once and its waiter gets a
+        ``RequestCanceledError``. The waiter still calls ``release``.
+
+        Args:
+            request_id: Request to cancel
+            notify: Tell the target to stop working on it, if it was sent
+                (default: ``cancel_notice``)
+
+        Returns:
+            True if the request was still pending
+        """
+        request_info = self.pending_requests.get(request_id)
+        if request_info is None or not self.pending_requests.fail(request_id, RequestCanceledError("Request canceled")):
+            return False
+        worker = self._assignments.get(request_id)
+        if notify is None:
+            notify = self.cancel_notice
+        if notify and worker is not None and worker.running and request_info['sent']:
+            # Targets that understand it stop work on the message with this id
+            worker.submit_notice(request_info['target'], {
+                'cancel': request_info['msg_id'],
+                'context_id': request_info['contextId'],
+            })
+        return True
+
+    def health(self) -> List[Dict[str, Any]]:
+        """Return a health snapshot for every worker."""
+        return [worker.health() for worker in self.workers]
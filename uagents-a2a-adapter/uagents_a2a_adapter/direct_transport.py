@@ -0,0 +1,185 @@
+"""Target resolution for the bridge: local endpoints first, cached almanac lookups after."""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from uagents.resolver import GlobalResolver, Resolver
+
+from .metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+Resolution = Tuple[Optional[str], List[str]]
+
+
+def _address(destination: str) -> str:
+    # Destinations may carry a network prefix such as "test-agent://"
+    return destination.rsplit("://", 1)[-1]
+
+
+class CachedResolver(Resolver):
+    """
+    Caches another resolver's lookups for ``ttl`` seconds.
+
+    A lookup through the almanac is a network round trip, and uAgents makes
+    one for every message sent. This resolver answers from memory instead.
+    An entry older than ``ttl`` is still returned at once while a refresh
+    runs in the background, so an expired entry never delays a send. Only
+    the first lookup of a destination, or one whose refreshes keep failing
+    for ``max_stale`` seconds, waits for the inner resolver; concurrent
+    lookups of one destination share a single request. ``prefetch``
+    resolves destinations ahead of their first message.
+
+    The cache may be shared by bridge agents running on different loops;
+    in-flight lookups are only shared within a loop.
+    """
+
+    def __init__(self, resolver: Optional[Resolver] = None, ttl: float = 300.0, max_stale: float = 3600.0,
+                 retry_interval: float = 10.0, latency: Optional[Histogram] = None):
+        """
+        Args:
+            resolver: Resolver whose lookups are cached (default: GlobalResolver())
+            ttl: Seconds before an entry is refreshed (default: 300)
+            max_stale: Seconds an entry may be served past its TTL while
+                refreshes fail (default: 3600)
+            retry_interval: Seconds between refreshes of an entry whose last
+                refresh failed (default: 10)
+            latency: Histogram observing the duration of each inner lookup
+        """
+        self.resolver = resolver or GlobalResolver()
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.retry_interval = retry_interval
+        self.latency = latency
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.failures = 0
+        self._cache: Dict[str, Tuple[float, Resolution]] = {}
+        self._in_flight: Dict[Tuple[int, str], asyncio.Future] = {}
+        self._retry_at: Dict[str, float] = {}
+
+    async def resolve(self, destination: str) -> Resolution:
+        entry = self._cache.get(destination)
+        if entry is not None:
+            age = time.monotonic() - entry[0]
+            if age < self.ttl:
+                self.hits += 1
+                return entry[1]
+            if age < self.ttl + self.max_stale:
+                # Serve the old endpoints and refresh them off the send path
+                self.stale_hits += 1
+                if time.monotonic() >= self._retry_at.get(destination, 0.0):
+                    self._lookup(destination)
+                return entry[1]
+        self.misses += 1
+        return await asyncio.shield(self._lookup(destination))
+
+    async def prefetch(self, destinations: Iterable[str]):
+        """Resolve ``destinations`` now so their first message finds them cached."""
+        await asyncio.gather(
+            *(asyncio.shield(self._lookup(destination)) for destination in destinations),
+            return_exceptions=True,
+        )
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache size and hit, stale-hit, miss and failure counters."""
+        return {
+            'entries': len(self._cache),
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'failures': self.failures,
+        }
+
+    def _lookup(self, destination: str) -> asyncio.Future:
+        # One lookup per destination and loop at a time
+        key = (id(asyncio.get_running_loop()), destination)
+        lookup = self._in_flight.get(key)
+        if lookup is None:
+            lookup = self._in_flight[key] = asyncio.ensure_future(self._refresh(destination))
+            lookup.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        return lookup
+
+    async def _refresh(self, destination: str) -> Resolution:
+        started = time.monotonic()
+        try:
+            address, endpoints = await self.resolver.resolve(destination)
+        except Exception as e:
+            self.failures += 1
+            logger.warning(f"Resolving {destination} failed: {e}")
+            address, endpoints = None, []
+        finally:
+            if self.latency is not None:
+                self.latency.observe(time.monotonic() - started)
+        if endpoints:
+            self._cache[destination] = (time.monotonic(), (address, endpoints))
+            self._retry_at.pop(destination, None)
+            return address, endpoints
+        self._retry_at[destination] = time.monotonic() + self.retry_interval
+        if destination in self._cache:
+            # Keep serving the last good endpoints until max_stale runs out
+            return self._cache[destination][1]
+        return address, endpoints
+
+
+class DirectEndpointResolver(Resolver):
+    """
+    uAgents resolver that sends to known agents over their local endpoint.
+
+    The almanac resolves an agent that uses a mailbox to its Agentverse
+    mailbox, so every message leaves the host and comes back even when both
+    agents run side by side. For agents with a known local endpoint (e.g.
+    ``http://127.0.0.1:8007/submit``) this resolver puts that endpoint first
+    and the almanac's endpoints after it. uAgents tries endpoints in order,
+    so messages go straight to the agent and fall back to the mailbox
+    automatically when the local endpoint cannot be reached. Other agents
+    are resolved by the fallback resolver alone.
+    """
+
+    def __init__(self, endpoints: Optional[Dict[str, str]] = None, fallback: Optional[Resolver] = None):
+        """
+        Args:
+            endpoints: Local endpoint per agent address
+            fallback: Resolver for everything else (default: GlobalResolver())
+        """
+        self.endpoints: Dict[str, str] = dict(endpoints or {})
+        self.fallback = fallback or GlobalResolver()
+        self.direct = 0
+        self.fallback_only = 0
+
+    async def prefetch(self, destinations: Iterable[str]):
+        """Warm the fallback resolver's cache for ``destinations``, if it has one."""
+        if hasattr(self.fallback, 'prefetch'):
+            await self.fallback.prefetch(destinations)
+
+    def add(self, address: str, endpoint: str):
+        """Send messages for ``address`` to ``endpoint`` first."""
+        self.endpoints[_address(address)] = endpoint
+        logger.info(f"Direct transport to {address} via {endpoint}, mailbox as fallback")
+
+    async def resolve(self, destination: str) -> Tuple[Optional[str], List[str]]:
+        endpoint = self.endpoints.get(_address(destination))
+        if endpoint is None:
+            self.fallback_only += 1
+            return await self.fallback.resolve(destination)
+
+        self.direct += 1
+        try:
+            address, fallback_endpoints = await self.fallback.resolve(destination)
+        except Exception as e:
+            # Local delivery does not need the almanac
+            logger.debug("Fallback resolution for %s failed: %s", destination, e)
+            address, fallback_endpoints = None, []
+        endpoints = [endpoint] + [other for other in fallback_endpoints or [] if other != endpoint]
+        return address or _address(destination), endpoints
+
+    def stats(self) -> Dict[str, int]:
+        """Return the number of local endpoints and resolutions by kind."""
+        return {
+            'endpoints': len(self.endpoints),
+            'direct': self.direct,
+            'fallback_only': self.fallback_only,
+        }
@@ -0,0 +1,82 @@
+"""Shared, pooled HTTP clients for outbound calls."""
+
+import importlib.util
+import logging
+from contextlib import asynccontextmanager
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPClientPool:
+    """
+    Long-lived httpx clients with bounded keep-alive connection pools.
+
+    Creating a client per call, or never closing one, throws away the open
+    connections and pays a TCP (and TLS) handshake for every request. A pool
+    hands out one async and one sync client, created on first use, that keep
+    connections to each host alive between requests.
+
+    The async client belongs to the event loop it is first used on, so an app
+    running on its own loop should get its own pool. Close the pool when the
+    app stops, e.g. through ``lifespan``.
+    """
+
+    def __init__(self, max_connections: int = 100, max_keepalive_connections: int = 20,
+                 keepalive_expiry: float = 30.0, timeout: float = 30.0, http2: bool = False):
+        """
+        Args:
+            max_connections: Maximum open connections per client (default: 100)
+            max_keepalive_connections: Idle connections kept open for reuse (default: 20)
+            keepalive_expiry: Seconds an idle connection is kept open (default: 30)
+            timeout: Default request timeout in seconds (default: 30)
+            http2: Negotiate HTTP/2 where the server supports it; needs the
+                ``h2`` package (``pip install httpx[http2]``) (default: False)
+        """
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = timeout
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 requested but the h2 package is not installed; using HTTP/1.1")
+            http2 = False
+        self.http2 = http2
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._client: Optional[httpx.Client] = None
+
+    def async_client(self) -> httpx.AsyncClient:
+        """Return the shared async client, creating it on first use."""
+        if self._async_client is None or self._async_client.is_closed:
+            self._async_client = httpx.AsyncClient(limits=self.limits, timeout=self.timeout, http2=self.http2)
+        return self._async_client
+
+    def client(self) -> httpx.Client:
+        """Return the shared sync client, creating it on first use."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.Client(limits=self.limits, timeout=self.timeout, http2=self.http2)
+        return self._client
+
+    async def aclose(self):
+        """Close both clients and their open connections."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+        self.close()
+
+    def close(self):
+        """Close the sync client; the async client needs ``aclose``."""
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    @asynccontextmanager
+    async def lifespan(self, app):
+        """Starlette lifespan that closes the pool when the app shuts down."""
+        try:
+            yield
+        finally:
+            await self.aclose()
@@ -1,21 +1,25 @@
+import json
 import logging
 import os
 import sys
 import click
-import httpx
 import uvicorn
 from a2a.server.apps import A2AStarletteApplication
 from a2a.server.request_handlers import DefaultRequestHandler
-from a2a.server.tasks import InMemoryPushNotifier, InMemoryTaskStore
-from a2a.types import (
-    AgentCapabilities,
-    AgentCard,
-    AgentSkill,
-)
+from a2a.server.tasks import InMemoryTaskStore
 from dotenv import load_dotenv
 
 # Import the generic agent executor
+from .admission import AdmissionController
 from .agentverse_agent_executor import AgentverseAgentExecutor
+from .bridge import BridgePool
+from .http_pool import HTTPClientPool
+from .metrics import metrics_route
+from .multi_agent import build_agent_card, build_multi_agent_app, server_lifespan
+from .push_notifications import BatchedPushNotifier
+from .response_cache import ResponseCache
+from .status_classifier import StatusClassifier
+from .task_store import SQLiteTaskStore
 
 load_dotenv()
 logging.basicConfig(level=logging.INFO)
@@ -24,74 +28,148 @@ logger = logging.getLogger(__name__)
 class MissingParameterError(Exception):
     """Exception for missing required parameters."""
 
+def load_agents_config(path):
+    """Load agent entries from a JSON file (a list, or an object with an "agents" list)."""
+    with open(path) as config_file:
+        config = json.load(config_file)
+    agents = config.get('agents') if isinstance(config, dict) else config
+    if not isinstance(agents, list) or not agents:
+        raise MissingParameterError(f'No agents found in {path}')
+    for agent in agents:
+        for key in ('skill_tags', 'skill_examples'):
+            if isinstance(agent.get(key), str):
+                agent[key] = [value.strip() for value in agent[key].split(',')]
+    return agents
+
 @click.command()
 @click.option('--host', 'host', default='localhost', help='Host to bind the server to')
 @click.option('--port', 'port', default=10000, help='Port to bind the server to')
-@click.option('--agent-address', 'agent_address', required=True, help='Agentverse agent address to bridge to')
+@click.option('--agent-address', 'agent_address', default=None, help='Agentverse agent address to bridge to')
+@click.option('--agent-endpoint', 'agent_endpoint', default=None,
+              help='Local endpoint of the target uAgent (e.g. http://127.0.0.1:8007/submit); '
+                   'messages go there directly and fall back to the mailbox')
+@click.option('--agents-config', 'agents_config', default=None, type=click.Path(exists=True, dir_okay=False),
+              help='JSON file listing several agents to serve from this process, each under its own path')
 @click.option('--agent-name', 'agent_name', default='Agentverse Agent', help='Name for the A2A agent')
 @click.option('--agent-description', 'agent_description', default='Agent bridged from Agentverse', help='Description for the A2A agent')
 @click.option('--skill-tags', 'skill_tags', default='general,assistance', help='Comma-separated skill tags')
 @click.option('--skill-examples', 'skill_examples', default='Help me with my query', help='Comma-separated skill examples')
-def main(host, port, agent_address, agent_name, agent_description, skill_tags, skill_examples):
+@click.option('--bridge-name', 'bridge_name', default='a2a_agentverse_bridge', help='Base name (and seed) for the bridge uAgents')
+@click.option('--bridge-port', 'bridge_port', default=8082, help='Port of the first bridge uAgent; further workers use the following ports')
+@click.option('--bridge-workers', 'bridge_workers', default=1, help='Number of bridge uAgents to spread requests over')
+@click.option('--bridge-mode', 'bridge_mode', type=click.Choice(['thread', 'integrated']), default='thread',
+              help='Run bridge uAgents on background threads or on the server event loop')
+@click.option('--bridge-startup-timeout', 'bridge_startup_timeout', default=10.0,
+              help='Seconds to wait for the bridge uAgents to start')
+@click.option('--resolve-ttl', 'resolve_ttl', default=300.0,
+              help='Seconds a resolved agent endpoint is used before it is refreshed in the background')
+@click.option('--context-in-text', 'context_in_text', is_flag=True, default=False,
+              help='Also prefix queries with [USER_CONTEXT:<contextId>] for target agents that '
+                   'read the context from the text rather than the context_id metadata')
+@click.option('--cancel-notice', 'cancel_notice', is_flag=True, default=False,
+              help='Tell the target agent when a task is canceled, with a metadata-only chat message; '
+                   'only for targets that understand it')
+@click.option('--response-timeout', 'response_timeout', default=120.0,
+              help='Longest a request may wait for the target agent, in seconds; '
+                   'clients can ask for less with a "timeout" in the message metadata')
+@click.option('--stream-quiet-period', 'stream_quiet_period', default=5.0,
+              help='Seconds without a message, after a partial reply, before that reply is taken as the answer')
+@click.option('--response-cache-ttl', 'response_cache_ttl', default=0.0,
+              help='Seconds completed answers are reused for identical new queries (0 turns the cache off); '
+                   'clients can bypass it with "no_cache" in the message metadata')
+@click.option('--response-cache-size', 'response_cache_size', default=1024,
+              help='Answers kept in the response cache, least recently used evicted first')
+@click.option('--http-max-connections', 'http_max_connections', default=100,
+              help='Maximum open connections for outbound HTTP (push notifications)')
+@click.option('--http-max-keepalive', 'http_max_keepalive', default=20,
+              help='Idle outbound HTTP connections kept open for reuse')
+@click.option('--http2', 'http2', is_flag=True, default=False,
+              help='Use HTTP/2 for outbound HTTP where supported (needs httpx[http2])')
+@click.option('--push-workers', 'push_workers', default=4, help='Concurrent push notification deliveries')
+@click.option('--push-per-destination', 'push_per_destination', default=4,
+              help='Concurrent push notification deliveries per webhook host')
+@click.option('--task-store', 'task_store_kind', type=click.Choice(['sqlite', 'memory']), default='sqlite',
+              help='Keep A2A tasks in a SQLite database or in memory only')
+@click.option('--task-db', 'task_db', default='a2a_tasks.db', help='SQLite database file for --task-store sqlite')
+@click.option('--task-ttl', 'task_ttl', default=86400.0, help='Seconds finished tasks are kept before pruning')
+@click.option('--status-rules', 'status_rules', default=None, type=click.Path(exists=True, dir_okay=False),
+              help='JSON file of regex rules that classify replies without an explicit status')
+@click.option('--max-concurrent-per-agent', 'max_per_target', default=64,
+              help='Requests bridged to one target agent at once; more wait in the queue')
+@click.option('--max-concurrent-per-context', 'max_per_context', default=1,
+              help='Requests running at once for one A2A contextId')
+@click.option('--max-queued', 'max_queued', default=256,
+              help='Requests allowed to wait for a slot before new ones are rejected with a retry hint')
+def main(host, port, agent_address, agent_endpoint, agents_config, agent_name, agent_description, skill_tags, skill_examples,
+         bridge_name, bridge_port, bridge_workers, bridge_mode, bridge_startup_timeout, resolve_ttl,
+         context_in_text, cancel_notice, response_timeout, stream_quiet_period, response_cache_ttl, response_cache_size,
+         http_max_connections, http_max_keepalive, http2,
+         push_workers, push_per_destination, task_store_kind, task_db, task_ttl, status_rules,
+         max_per_target, max_per_context, max_queued):
     """Starts the Agentverse Bridge A2A server."""
     try:
+        http_pool = HTTPClientPool(
+            max_connections=http_max_connections,
+            max_keepalive_connections=http_max_keepalive,
+            http2=http2,
+        )
+        push_notifier = BatchedPushNotifier(
+            http_pool.async_client(),
+            workers=push_workers,
+            max_per_destination=push_per_destination,
+        )
+        task_store = create_task_store(task_store_kind, task_db, task_ttl)
+        status_classifier = StatusClassifier.from_file(status_rules) if status_rules else StatusClassifier()
+        admission = AdmissionController(
+            max_per_target=max_per_target,
+            max_per_context=max_per_context,
+            max_waiting=max_queued,
+        )
+        response_cache = None
+        if response_cache_ttl > 0:
+            response_cache = ResponseCache(ttl=response_cache_ttl, max_entries=response_cache_size)
+        if agents_config:
+            run_multi_agent_server(host, port, agents_config, bridge_name, bridge_port, bridge_workers,
+                                   bridge_mode, http_pool, push_notifier, task_store, status_classifier,
+                                   admission, bridge_startup_timeout, response_timeout, resolve_ttl,
+                                   response_cache, context_in_text, cancel_notice, stream_quiet_period)
+            return
+        if not agent_address:
+            raise MissingParameterError('--agent-address or --agents-config is required')
+        
         logger.info(f"Starting A2A server bridged to Agentverse agent: {agent_address}")
         
         # Parse comma-separated values
         tags = [tag.strip() for tag in skill_tags.split(',')]
         examples = [example.strip() for example in skill_examples.split(',')]
-        
-        # Create agent capabilities
-        capabilities = AgentCapabilities(streaming=True, pushNotifications=True)
-        
-        # Create agent skill
-        skill = AgentSkill(
-            id='agentverse_bridge',
-            name=f'{agent_name} Bridge',
-            description=agent_description,
-            tags=tags,
-            examples=examples,
-        )
-
-        # Create agent card
-        agent_card = AgentCard(
-            name=agent_name,
-            description=agent_description,
-            url=f'http://{host}:{port}/',
-            version='1.0.0',
-            defaultInputModes=['text', 'text/plain'],
-            defaultOutputModes=['text', 'text/plain'],
-            capabilities=capabilities,
-            skills=[skill],
-        )
-
-        # Create the bridge executor with the target agent address
-        bridge_executor = AgentverseAgentExecutor(
-            target_agent_address=agent_address,
-            bridge_name="a2a_agentverse_bridge",
-            bridge_port=8082
-        )
 
-        # Create request handler
-        httpx_client = httpx.AsyncClient()
-        request_handler = DefaultRequestHandler(
-            agent_executor=bridge_executor,
-            task_store=InMemoryTaskStore(),
-            push_notifier=InMemoryPushNotifier(httpx_client),
-        )
-
-        # Create and run server
-        server = A2AStarletteApplication(
-            agent_card=agent_card, 
-            http_handler=request_handler
+        bridge_pool = create_bridge_pool(bridge_name, bridge_port, bridge_workers, bridge_mode,
+                                         bridge_startup_timeout, response_timeout, resolve_ttl=resolve_ttl,
+                                         context_in_text=context_in_text, cancel_notice=cancel_notice)
+        app = create_app(
+            agent_address, host, port, bridge_pool,
+            agent_name=agent_name,
+            agent_description=agent_description,
+            skill_tags=tags,
+            skill_examples=examples,
+            http_pool=http_pool,
+            push_notifier=push_notifier,
+            task_store=task_store,
+            status_classifier=status_classifier,
+            admission=admission,
+            response_timeout=response_timeout,
+            stream_quiet_period=stream_quiet_period,
+            agent_endpoint=agent_endpoint,
+            response_cache=response_cache,
         )
 
         logger.info(f"🚀 A2A server starting on {host}:{port}")
         logger.info(f"🔗 Bridging to Agentverse agent: {agent_address}")
         logger.info(f"📋 Agent name: {agent_name}")
         logger.info(f"🏷️  Tags: {', '.join(tags)}")
+        logger.info(f"🌉 Bridge workers: {bridge_workers} (ports {bridge_port}-{bridge_port + bridge_workers - 1})")
         
-        uvicorn.run(server.build(), host=host, port=port)
+        uvicorn.run(app, host=host, port=port)
 
     except MissingParameterError as e:
         logger.error(f'Error: {e}')
@@ -100,5 +178,110 @@ def main(host, port, agent_address, agent_name, agent_description, skill_tags, s
         logger.error(f'An error occurred during server startup: {e}')
         sys.exit(1)
 
+def create_app(agent_address, host, port, bridge_pool, agent_name='Agentverse Agent',
+               agent_description='Agent bridged from Agentverse', skill_tags=('general', 'assistance'),
+               skill_examples=('Help me with my query',), http_pool=None, push_notifier=None, task_store=None,
+               status_classifier=None, admission=None, response_timeout=120.0, agent_endpoint=None,
+               response_cache=None, stream_quiet_period=5.0):
+    """
+    Build the single-agent A2A app served by ``main``.
+
+    Integrated bridge pools are started and stopped by the app's lifespan;
+    thread-mode pools must already be running. Components left as None get
+    the CLI defaults.
+    """
+    http_pool = http_pool or HTTPClientPool()
+    push_notifier = push_notifier or BatchedPushNotifier(http_pool.async_client())
+    task_store = task_store or create_task_store()
+    admission = admission or AdmissionController()
+
+    # Create agent card
+    agent_card = build_agent_card(
+        name=agent_name,
+        description=agent_description,
+        url=f'http://{host}:{port}/',
+        skill_tags=list(skill_tags),
+        skill_examples=list(skill_examples),
+    )
+
+    # Create the bridge executor with the target agent address
+    bridge_executor = AgentverseAgentExecutor(
+        target_agent_address=agent_address,
+        bridge_pool=bridge_pool,
+        status_classifier=status_classifier,
+        admission=admission,
+        response_timeout=response_timeout,
+        stream_quiet_period=stream_quiet_period,
+        target_endpoint=agent_endpoint,
+        response_cache=response_cache,
+    )
+
+    # Create request handler
+    request_handler = DefaultRequestHandler(
+        agent_executor=bridge_executor,
+        task_store=task_store,
+        push_notifier=push_notifier,
+    )
+
+    # Create server
+    server = A2AStarletteApplication(
+        agent_card=agent_card, 
+        http_handler=request_handler
+    )
+    app = server.build(lifespan=server_lifespan(bridge_pool, http_pool, [push_notifier], [task_store]))
+    app.routes.append(metrics_route(bridge_pool, admission, [push_notifier], [task_store],
+                                    response_caches=[response_cache] if response_cache else []))
+    return app
+
+def create_bridge_pool(bridge_name, bridge_port, bridge_workers, bridge_mode, startup_timeout=10.0,
+                       response_timeout=120.0, agent_options=None, resolve_ttl=300.0, context_in_text=False,
+                       cancel_notice=False):
+    """Create the bridge pool; thread-mode pools are started right away."""
+    bridge_pool = BridgePool(
+        bridge_name=bridge_name,
+        bridge_port=bridge_port,
+        workers=bridge_workers,
+        # Unanswered requests outlive their waiter by a grace period at most
+        request_ttl=response_timeout + 30,
+        integrated=bridge_mode == 'integrated',
+        startup_timeout=startup_timeout,
+        agent_options=agent_options,
+        resolve_ttl=resolve_ttl,
+        context_in_text=context_in_text,
+        cancel_notice=cancel_notice,
+    )
+    if not bridge_pool.integrated:
+        bridge_pool.start()
+    return bridge_pool
+
+def create_task_store(kind='sqlite', path='a2a_tasks.db', ttl=86400.0):
+    """Create the task store shared by the server's agents."""
+    if kind == 'memory':
+        return InMemoryTaskStore()
+    return SQLiteTaskStore(path=path, completed_ttl=ttl)
+
+def run_multi_agent_server(host, port, agents_config, bridge_name, bridge_port, bridge_workers, bridge_mode,
+                           http_pool=None, push_notifier=None, task_store=None, status_classifier=None,
+                           admission=None, bridge_startup_timeout=10.0, response_timeout=120.0,
+                           resolve_ttl=300.0, response_cache=None, context_in_text=False,
+                           cancel_notice=False, stream_quiet_period=5.0):
+    """Serve every agent in ``agents_config`` from one server and one bridge pool."""
+    agents = load_agents_config(agents_config)
+    logger.info(f"Starting A2A server for {len(agents)} Agentverse agents")
+    
+    bridge_pool = create_bridge_pool(bridge_name, bridge_port, bridge_workers, bridge_mode,
+                                     bridge_startup_timeout, response_timeout, resolve_ttl=resolve_ttl,
+                                     context_in_text=context_in_text, cancel_notice=cancel_notice)
+    app = build_multi_agent_app(agents, host, port, bridge_pool, http_pool=http_pool,
+                                push_notifier=push_notifier, task_store=task_store,
+                                status_classifier=status_classifier, admission=admission,
+                                response_timeout=response_timeout, response_cache=response_cache,
+                                stream_quiet_period=stream_quiet_period)
+    
+    logger.info(f"🚀 A2A server starting on {host}:{port}")
+    logger.info(f"🌉 Bridge workers: {bridge_workers} (ports {bridge_port}-{bridge_port + bridge_workers - 1})")
+    
+    uvicorn.run(app, host=host, port=port)
+
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,234 @@
+"""Prometheus-style metrics for the bridge hot path."""
+
+import bisect
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Latency buckets in seconds, from a local round trip up to the response timeout
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# One sample: name suffix, labels and value
+Sample = Tuple[str, Dict[str, str], float]
+
+
+class Histogram:
+    """
+    Cumulative latency histogram in the Prometheus format.
+
+    Observations may come from the server loop and from bridge threads, so
+    updates take a lock.
+    """
+
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def samples(self) -> List[Sample]:
+        with self._lock:
+            counts, total = list(self._counts), self._sum
+        samples = []
+        cumulative = 0
+        for bound, count in zip(self.buckets, counts):
+            cumulative += count
+            samples.append(("_bucket", {'le': _format_value(bound)}, cumulative))
+        cumulative += counts[-1]
+        samples.append(("_bucket", {'le': "+Inf"}, cumulative))
+        samples.append(("_sum", {}, total))
+        samples.append(("_count", {}, cumulative))
+        return samples
+
+
+class Counter:
+    """Monotonic counter; thread-safe."""
+
+    def __init__(self, name: str, documentation: str):
+        self.name = name
+        self.documentation = documentation
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1):
+        with self._lock:
+            self.value += amount
+
+    def samples(self) -> List[Sample]:
+        return [("_total", {}, self.value)]
+
+
+class BridgeMetrics:
+    """
+    Latency histograms and counters recorded on the bridge hot path.
+
+    One instance belongs to each ``BridgePool`` and is shared by its workers
+    and by every executor using the pool.
+    """
+
+    def __init__(self):
+        self.queue_wait = Histogram(
+            "a2a_bridge_queue_wait_seconds",
+            "Time from submitting a request until the bridge sends it to the target agent",
+        )
+        self.send_to_reply = Histogram(
+            "a2a_bridge_send_to_reply_seconds",
+            "Time from sending a request until the target agent's first reply arrives",
+        )
+        self.request_duration = Histogram(
+            "a2a_request_duration_seconds",
+            "Time from receiving an A2A request until its task ends, admission wait included",
+        )
+        self.resolve_latency = Histogram(
+            "a2a_bridge_resolve_seconds",
+            "Time an almanac lookup of a target agent's endpoints takes; cache hits are not observed",
+        )
+        self.timeouts = Counter(
+            "a2a_request_timeouts",
+            "Requests whose deadline passed before the target agent finished",
+        )
+
+    def families(self) -> List[Tuple[str, str, str, List[Sample]]]:
+        return [
+            (metric.name, kind, metric.documentation, metric.samples())
+            for metric, kind in (
+                (self.queue_wait, 'histogram'),
+                (self.send_to_reply, 'histogram'),
+                (self.request_duration, 'histogram'),
+                (self.resolve_latency, 'histogram'),
+                (self.timeouts, 'counter'),
+            )
+        ]
+
+
+def _format_value(value: float) -> str:
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = []
+    for key, value in labels.items():
+        value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{key}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def render(families: Iterable[Tuple[str, str, str, List[Sample]]]) -> str:
+    """Render ``(name, type, help, samples)`` families in the Prometheus text format."""
+    lines = []
+    for name, kind, documentation, samples in families:
+        lines.append(f"# HELP {name} {documentation}")
+        lines.append(f"# TYPE {name} {kind}")
+        for suffix, labels, value in samples:
+            lines.append(f"{name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def _stats_families(prefix: str, stats: Dict[str, Any],
+                    counters: Sequence[str] = ()) -> List[Tuple[str, str, str, List[Sample]]]:
+    # Numeric stats become gauges, or counters for the keys listed
+    families = []
+    for key, value in stats.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            continue
+        if key in counters:
+            families.append((f"{prefix}_{key}", 'counter', f"{key} reported by stats()", [("_total", {}, value)]))
+        else:
+            families.append((f"{prefix}_{key}", 'gauge', f"{key} reported by stats()", [("", {}, value)]))
+    return families
+
+
+def collect(bridge_pool, admission=None, push_notifiers: Sequence[Any] = (),
+            task_stores: Sequence[Any] = (), response_caches: Sequence[Any] = (),
+            extra: Sequence[Callable[[], Iterable[Tuple[str, str, str, List[Sample]]]]] = ()) -> str:
+    """
+    Render the pool's latency metrics plus gauges and counters read from the
+    ``stats()`` of the pool, admission controller, push notifiers, task stores
+    and response caches.
+    """
+    families = bridge_pool.metrics.families()
+
+    pending = bridge_pool.pending_requests.stats()
+    families += [
+        ("a2a_bridge_pending_requests", 'gauge', "Requests waiting for a reply from their target agent",
+         [("", {}, pending['pending'])]),
+        ("a2a_bridge_evicted_requests", 'counter', "Pending requests evicted by the TTL or the size bound",
+         [("_total", {}, pending['evicted'])]),
+        # Mis-correlated replies show up here: no waiter could be found for them
+        ("a2a_bridge_orphaned_replies", 'counter', "Replies that matched no pending request",
+         [("_total", {}, pending['orphaned'])]),
+    ]
+
+    families += _stats_families("a2a_bridge_resolve", bridge_pool.resolver.stats(),
+                                counters=('direct', 'fallback_only'))
+    families += _stats_families("a2a_bridge_resolve_cache", bridge_pool.resolve_cache.stats(),
+                                counters=('hits', 'stale_hits', 'misses', 'failures'))
+
+    workers = bridge_pool.health()
+    for metric, kind, documentation in (
+        ('running', 'gauge', "Whether the bridge agent is running"),
+        ('healthy', 'gauge', "Whether the bridge agent receives new requests"),
+        ('in_flight', 'gauge', "Requests waiting for a reply through the bridge agent"),
+        ('sent', 'counter', "Requests sent by the bridge agent"),
+        ('failures', 'counter', "Failed sends by the bridge agent"),
+    ):
+        suffix = "_total" if kind == 'counter' else ""
+        families.append((
+            f"a2a_bridge_worker_{metric}", kind, documentation,
+            [(suffix, {'worker': worker['name']}, int(worker[metric])) for worker in workers],
+        ))
+
+    if admission is not None:
+        families += _stats_families("a2a_admission", admission.stats(), counters=('admitted', 'rejected'))
+    for push_notifier in push_notifiers:
+        if hasattr(push_notifier, 'stats'):
+            families += _stats_families(
+                "a2a_push", push_notifier.stats(),
+                counters=('sent', 'failed', 'retried', 'coalesced', 'dropped'),
+            )
+    for task_store in task_stores:
+        if hasattr(task_store, 'stats'):
+            families += _stats_families("a2a_task_store", task_store.stats())
+    for response_cache in response_caches:
+        families += _stats_families("a2a_response_cache", response_cache.stats(),
+                                    counters=('hits', 'misses', 'coalesced', 'evicted'))
+    for source in extra:
+        families += list(source())
+    return render(families)
+
+
+def metrics_route(bridge_pool, admission=None, push_notifiers: Sequence[Any] = (),
+                  task_stores: Sequence[Any] = (), path: str = "/metrics", response_caches: Sequence[Any] = (),
+                  extra: Sequence[Callable[[], Iterable[Tuple[str, str, str, List[Sample]]]]] = ()) -> Route:
+    """
+    Starlette route serving the metrics of one server in the Prometheus text format.
+
+    Args:
+        bridge_pool: Bridge pool whose latency metrics and health are served
+        admission: Admission controller, if any
+        push_notifiers: Push notifiers with ``stats()``; others are skipped
+        task_stores: Task stores with ``stats()``; others are skipped
+        path: Route path (default: "/metrics")
+        response_caches: Response caches, if any
+        extra: Callables returning further ``(name, type, help, samples)`` families
+    """
+    async def metrics(request: Request) -> Response:
+        text = collect(bridge_pool, admission, push_notifiers, task_stores, response_caches, extra)
+        return Response(text, media_type=CONTENT_TYPE)
+
+    return Route(path, metrics, methods=["GET"])
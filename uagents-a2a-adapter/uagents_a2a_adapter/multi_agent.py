@@ -0,0 +1,253 @@
+"""Serve many Agentverse agents from one A2A process over a shared bridge pool."""
+
+import logging
+import re
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from a2a.server.agent_execution import AgentExecutor, RequestContext
+from a2a.server.apps import A2AStarletteApplication
+from a2a.server.events import EventQueue
+from a2a.server.request_handlers import DefaultRequestHandler
+from a2a.server.tasks import InMemoryTaskStore, TaskStore
+from a2a.types import AgentCapabilities, AgentCard, AgentSkill
+from starlette.applications import Starlette
+from starlette.routing import Host, Mount
+
+from .admission import AdmissionController
+from .agentverse_agent_executor import AgentverseAgentExecutor
+from .bridge import BridgePool
+from .http_pool import HTTPClientPool
+from .metrics import metrics_route
+from .push_notifications import BatchedPushNotifier
+from .response_cache import ResponseCache
+from .status_classifier import StatusClassifier
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutorRegistry:
+    """
+    Per-target ``AgentverseAgentExecutor`` instances sharing one bridge pool.
+
+    Executors are created on the first request for their target, so hosting
+    dozens of agents costs nothing until they are used.
+    """
+
+    def __init__(self, bridge_pool: BridgePool, status_classifier: Optional[StatusClassifier] = None,
+                 admission: Optional[AdmissionController] = None, response_timeout: float = 120.0,
+                 response_cache: Optional[ResponseCache] = None, stream_quiet_period: float = 5.0):
+        self.bridge_pool = bridge_pool
+        self.response_cache = response_cache
+        self.status_classifier = status_classifier
+        self.response_timeout = response_timeout
+        self.stream_quiet_period = stream_quiet_period
+        # Quiet periods of targets that override stream_quiet_period
+        self.quiet_periods: Dict[str, float] = {}
+        # One controller, so the wait queue bound applies to the whole server
+        self.admission = admission or AdmissionController()
+        self._executors: Dict[str, AgentverseAgentExecutor] = {}
+
+    def __len__(self) -> int:
+        return len(self._executors)
+
+    def get(self, target_agent_address: str) -> AgentverseAgentExecutor:
+        """Return the executor for ``target_agent_address``, creating it if needed."""
+        executor = self._executors.get(target_agent_address)
+        if executor is None:
+            executor = AgentverseAgentExecutor(
+                target_agent_address=target_agent_address,
+                bridge_pool=self.bridge_pool,
+                status_classifier=self.status_classifier,
+                admission=self.admission,
+                response_timeout=self.response_timeout,
+                stream_quiet_period=self.quiet_periods.get(target_agent_address, self.stream_quiet_period),
+                response_cache=self.response_cache,
+            )
+            self._executors[target_agent_address] = executor
+        return executor
+
+
+class LazyAgentExecutor(AgentExecutor):
+    """AgentExecutor that resolves its target's executor from a registry on first use."""
+
+    def __init__(self, registry: ExecutorRegistry, target_agent_address: str):
+        self.registry = registry
+        self.target_agent_address = target_agent_address
+
+    async def execute(self, context: RequestContext, event_queue: EventQueue) -> None:
+        await self.registry.get(self.target_agent_address).execute(context, event_queue)
+
+    async def cancel(self, context: RequestContext, event_queue: EventQueue) -> None:
+        await self.registry.get(self.target_agent_address).cancel(context, event_queue)
+
+
+def build_agent_card(name: str, description: str, url: str, skill_tags: List[str],
+                     skill_examples: List[str]) -> AgentCard:
+    """Build the A2A agent card advertised for a bridged uAgent."""
+    # Create agent capabilities
+    capabilities = AgentCapabilities(streaming=True, pushNotifications=True)
+
+    # Create agent skill
+    skill = AgentSkill(
+        id='agentverse_bridge',
+        name=f'{name} Bridge',
+        description=description,
+        tags=skill_tags,
+        examples=skill_examples,
+    )
+
+    # Create agent card
+    return AgentCard(
+        name=name,
+        description=description,
+        url=url,
+        version='1.0.0',
+        defaultInputModes=['text', 'text/plain'],
+        defaultOutputModes=['text', 'text/plain'],
+        capabilities=capabilities,
+        skills=[skill],
+    )
+
+
+def server_lifespan(bridge_pool: BridgePool, http_pool: Optional[HTTPClientPool] = None,
+                    push_notifiers: Sequence[BatchedPushNotifier] = (),
+                    task_stores: Sequence[TaskStore] = ()) -> Callable:
+    """
+    App lifespan that runs an integrated bridge pool and closes the HTTP pool.
+
+    Thread-mode bridge pools are started before the app and are left alone.
+    On shutdown, queued push notifications are flushed before the HTTP pool
+    they are sent with is closed, and task stores write out pending tasks.
+    """
+    @asynccontextmanager
+    async def lifespan(app):
+        async with AsyncExitStack() as stack:
+            if http_pool is not None:
+                await stack.enter_async_context(http_pool.lifespan(app))
+            if bridge_pool.integrated:
+                await stack.enter_async_context(bridge_pool.lifespan(app))
+            for task_store in task_stores:
+                if hasattr(task_store, 'aclose'):
+                    stack.push_async_callback(task_store.aclose)
+            for push_notifier in push_notifiers:
+                stack.push_async_callback(push_notifier.aclose)
+            yield
+
+    return lifespan
+
+
+def agent_path(agent: Dict[str, Any]) -> str:
+    """Mount path for an agent entry; defaults to a slug of its name."""
+    path = agent.get("path") or re.sub(r"[^a-z0-9]+", "-", agent.get("name", "agent").lower()).strip("-")
+    return "/" + path.strip("/")
+
+
+def build_multi_agent_app(agents: List[Dict[str, Any]], host: str, port: int, bridge_pool: BridgePool,
+                          http_pool: Optional[HTTPClientPool] = None,
+                          push_notifier: Optional[BatchedPushNotifier] = None,
+                          task_store: Optional[TaskStore] = None,
+                          status_classifier: Optional[StatusClassifier] = None,
+                          admission: Optional[AdmissionController] = None,
+                          response_timeout: float = 120.0,
+                          response_cache: Optional[ResponseCache] = None,
+                          stream_quiet_period: float = 5.0,
+                          lifespan: Optional[Callable] = None) -> Starlette:
+    """
+    Build one Starlette app exposing an A2A endpoint per target agent, and
+    the server's metrics at ``/metrics``.
+
+    Args:
+        agents: Agent entries, each with:
+            - agent_address (str): Required - The uAgent address to bridge to
+            - name (str): Optional - Agent name (default: "A2A Agent")
+            - description (str): Optional - Agent description
+            - path (str): Optional - Mount path (default: slug of the name)
+            - virtual_host (str): Optional - Serve this agent on a host name instead of a path
+            - endpoint (str): Optional - Local endpoint of the uAgent, used
+              before the mailbox (e.g. "http://127.0.0.1:8007/submit")
+            - cache_ttl (float): Optional - Seconds this agent's completed answers
+              are served from the response cache (default: the cache's TTL, or no caching)
+            - stream_quiet_period (float): Optional - Seconds of silence after a partial
+              reply before it is taken as the answer (default: ``stream_quiet_period``)
+            - skill_tags (List[str]): Optional - List of skill tags
+            - skill_examples (List[str]): Optional - List of skill examples
+        host: Host the server binds to, used in agent card URLs
+        port: Port the server binds to, used in agent card URLs
+        bridge_pool: Bridge pool shared by every agent
+        http_pool: Connection pool for push notifications (default: a new HTTPClientPool)
+        push_notifier: Push notifier shared by every agent (default: a new
+            BatchedPushNotifier on ``http_pool``)
+        task_store: Task store shared by every agent, e.g. a ``SQLiteTaskStore``
+            to keep tasks across restarts (default: a new InMemoryTaskStore)
+        status_classifier: Decides the state of final replies (default: built-in rules)
+        admission: Concurrency limits shared by every agent (default: AdmissionController())
+        response_timeout: Longest a request may take in seconds (default: 120)
+        response_cache: Response cache shared by every agent (default: one
+            for the agents with a ``cache_ttl``, if any)
+        stream_quiet_period: Seconds of silence after a partial reply before
+            it is taken as the answer (default: 5)
+        lifespan: Lifespan for the combined app (default: ``server_lifespan``
+            for the bridge and HTTP pools, push notifier and task store)
+
+    Returns:
+        The combined Starlette application
+    """
+    if response_cache is None and any("cache_ttl" in agent for agent in agents):
+        # Only the agents with a cache_ttl are cached
+        response_cache = ResponseCache(ttl=0)
+    registry = ExecutorRegistry(bridge_pool, status_classifier, admission, response_timeout, response_cache,
+                                stream_quiet_period)
+    http_pool = http_pool or HTTPClientPool()
+    # Every agent shares one delivery queue, client and set of connections
+    push_notifier = push_notifier or BatchedPushNotifier(http_pool.async_client())
+    # Task ids are unique, so one store serves every agent
+    task_store = task_store or InMemoryTaskStore()
+    # One /metrics route for the whole process, ahead of the agent mounts
+    routes = [metrics_route(bridge_pool, registry.admission, [push_notifier], [task_store],
+                            response_caches=[response_cache] if response_cache else [])]
+    seen = set()
+    for agent in agents:
+        agent_address = agent.get("agent_address")
+        if not agent_address:
+            raise ValueError("agent_address is required for every agent")
+        # Executors are created on first request; resolve their targets now
+        bridge_pool.add_target(agent_address)
+        if "cache_ttl" in agent:
+            response_cache.set_ttl(agent_address, float(agent["cache_ttl"]))
+        if "stream_quiet_period" in agent:
+            registry.quiet_periods[agent_address] = float(agent["stream_quiet_period"])
+        if agent.get("endpoint"):
+            bridge_pool.add_direct_endpoint(agent_address, agent["endpoint"])
+        name = agent.get("name", "A2A Agent")
+        description = agent.get("description", "uAgent bridged to A2A HTTP endpoint")
+        virtual_host = agent.get("virtual_host")
+        path = "" if virtual_host else agent_path(agent)
+        route_key = virtual_host or path
+        if route_key in seen:
+            raise ValueError(f"Duplicate agent route: {route_key}")
+        seen.add(route_key)
+
+        base_url = f"http://{virtual_host}:{port}" if virtual_host else f"http://{host}:{port}{path}"
+        agent_card = build_agent_card(
+            name=name,
+            description=description,
+            url=f"{base_url}/",
+            skill_tags=agent.get("skill_tags", ["general", "assistance"]),
+            skill_examples=agent.get("skill_examples", ["Help me with my query"]),
+        )
+        request_handler = DefaultRequestHandler(
+            agent_executor=LazyAgentExecutor(registry, agent_address),
+            task_store=task_store,
+            push_notifier=push_notifier,
+        )
+        server = A2AStarletteApplication(agent_card=agent_card, http_handler=request_handler)
+        if virtual_host:
+            routes.append(Host(virtual_host, app=server.build()))
+        else:
+            routes.append(Mount(path, app=server.build()))
+        logger.info(f"📋 Mounted {name} at {base_url}/ -> {agent_address}")
+
+    # Mounted apps do not get lifespan events, so it belongs to the outer app
+    lifespan = lifespan or server_lifespan(bridge_pool, http_pool, [push_notifier], [task_store])
+    return Starlette(routes=routes, lifespan=lifespan)
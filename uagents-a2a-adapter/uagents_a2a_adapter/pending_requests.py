@@ -0,0 +1,273 @@
+"""Pending request bookkeeping for the A2A bridge."""
+
+import asyncio
+import threading
+import time
+from contextlib import nullcontext
+from typing import Any, Dict, Optional, Tuple
+from uuid import uuid4
+
+
+class RequestEvictedError(Exception):
+    """Raised to a waiter whose request was evicted from the store."""
+
+
+class RequestCanceledError(Exception):
+    """Raised to a waiter whose request was canceled by its A2A client."""
+
+
+class RequestExpiredError(Exception):
+    """Raised to a waiter whose deadline passed before the request was sent."""
+
+
+class PendingRequestStore:
+    """
+    Requests waiting for replies from a target uAgent.
+
+    Each request owns a queue that receives every reply message for it, so a
+    target can stream several messages before the final one. Replies are
+    routed back to their waiter in O(1) through two indexes: the ``msg_id``
+    of the outgoing ``ChatMessage`` (echoed by the target as ``in_reply_to``)
+    and the A2A context id. Targets that echo neither fall back to the oldest
+    sent request for the replying address.
+
+    The store is shared between the A2A server loop, which adds requests and
+    waits on them, and the bridge agent loop, which sends and resolves them,
+    so every access is guarded by a lock. When both sides share one loop the
+    store can be created with ``thread_safe=False`` to skip the locking.
+
+    The table is bounded: requests idle for longer than ``ttl`` are evicted,
+    and when ``max_size`` is reached the oldest request is evicted to make
+    room. Evicted waiters get a ``RequestEvictedError``.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: float = 150.0, thread_safe: bool = True):
+        """
+        Args:
+            max_size: Maximum number of requests kept at once (default: 10000)
+            ttl: Seconds after which an idle request is evicted (default: 150)
+            thread_safe: Lock accesses and deliver replies across loops (default: True)
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.thread_safe = thread_safe
+        self.evicted = 0
+        self.orphaned = 0
+        self._lock = threading.Lock() if thread_safe else nullcontext()
+        self._requests: Dict[str, Dict[str, Any]] = {}
+        self._by_msg_id: Dict[str, str] = {}
+        self._by_context: Dict[str, Dict[str, None]] = {}
+        self._by_target: Dict[str, Dict[str, None]] = {}
+
+    def __len__(self) -> int:
+        return len(self._requests)
+
+    def __contains__(self, request_id: str) -> bool:
+        return request_id in self._requests
+
+    def add(self, query: str, context_id: str, deadline: Optional[float] = None) -> Tuple[str, asyncio.Queue]:
+        """
+        Register a request under a new unique id.
+
+        Must be called from the loop that is going to read the queue.
+
+        Args:
+            query: Query text to send
+            context_id: A2A context id of the request
+            deadline: Wall-clock time (``time.time()``) after which the
+                caller no longer waits for a reply, if any
+
+        Returns:
+            The request id and the queue its replies will be put on. Each item
+            is a reply dict with ``parts``, ``metadata`` and ``final`` keys, or
+            an exception if the request failed.
+        """
+        request_id = f"req_{context_id}_{uuid4().hex}"
+        replies = asyncio.Queue()
+        now = time.monotonic()
+        with self._lock:
+            evicted = self._evict(now)
+            self._requests[request_id] = {
+                'query': query,
+                'contextId': context_id,
+                'deadline': deadline,
+                'sent': False,
+                'target': None,
+                'msg_id': None,
+                'streaming': False,
+                'created': now,
+                'sent_at': None,
+                'touched': now,
+                'replies': replies,
+                'loop': asyncio.get_running_loop(),
+            }
+        for request_info in evicted:
+            self._fail(request_info, RequestEvictedError("Pending request evicted"))
+        return request_id, replies
+
+    def get(self, request_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._requests.get(request_id)
+
+    def mark_sent(self, request_id: str, msg_id: str, target: str):
+        """Record the outgoing message so its reply can be correlated."""
+        with self._lock:
+            request_info = self._requests.get(request_id)
+            if request_info is None:
+                return
+            request_info['sent'] = True
+            request_info['sent_at'] = time.monotonic()
+            request_info['target'] = target
+            request_info['msg_id'] = msg_id
+            self._by_msg_id[msg_id] = request_id
+            self._by_context.setdefault(request_info['contextId'], {})[request_id] = None
+            self._by_target.setdefault(target, {})[request_id] = None
+
+    def match(
+        self,
+        sender: str,
+        in_reply_to: Optional[str] = None,
+        context_id: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Find the request a reply from ``sender`` belongs to.
+
+        Args:
+            sender: Address of the replying agent
+            in_reply_to: ``msg_id`` of our message echoed by the target, if any
+            context_id: A2A context id echoed by the target, if any
+
+        Returns:
+            The matching request id, or None if no request is waiting
+        """
+        with self._lock:
+            if in_reply_to:
+                # An explicit reference is authoritative: a late reply to a
+                # request that is gone must not be handed to another waiter
+                request_id = self._by_msg_id.get(in_reply_to)
+            else:
+                request_id = None
+                if context_id:
+                    request_id = self._first_from(self._by_context.get(context_id), sender)
+                if request_id is None:
+                    request_id = self._first_from(self._by_target.get(sender), sender)
+            if request_id is None:
+                self.orphaned += 1
+            return request_id
+
+    def _first_from(self, request_ids: Optional[Dict[str, None]], sender: str) -> Optional[str]:
+        # Oldest entry first; the sender check keeps context matches from
+        # crossing over to a request sent to another agent.
+        for request_id in request_ids or ():
+            if self._requests[request_id]['target'] == sender:
+                return request_id
+        return None
+
+    def deliver(self, request_id: str, reply: Dict[str, Any], final: Optional[bool] = None) -> bool:
+        """
+        Put one reply message on the request's queue; thread-safe.
+
+        Args:
+            request_id: Request the reply belongs to
+            reply: Reply dict with ``parts`` and ``metadata``
+            final: True if the target marked this as its last message, False
+                if it marked more to follow, None if it did not say. An
+                unmarked reply ends the request unless the target has already
+                sent a message marked as partial for it.
+
+        Returns:
+            True if a waiting request was found
+        """
+        with self._lock:
+            request_info = self._requests.get(request_id)
+            if request_info is None:
+                return False
+            if final is None:
+                final = not request_info['streaming']
+            if final:
+                self._pop(request_id)
+            else:
+                request_info['streaming'] = True
+                # Keep active streams at the young end of the eviction order
+                request_info['touched'] = time.monotonic()
+                self._requests[request_id] = self._requests.pop(request_id)
+        self._put(request_info, dict(reply, final=final))
+        return True
+
+    def resolve(self, request_id: str, response: str) -> bool:
+        """Deliver a single plain-text reply that ends the request."""
+        return self.deliver(request_id, {'parts': [response], 'metadata': {}}, final=True)
+
+    def fail(self, request_id: str, error: Exception) -> bool:
+        """Remove a request and raise ``error`` in its waiter; thread-safe."""
+        request_info = self.remove(request_id)
+        if request_info is None:
+            return False
+        self._fail(request_info, error)
+        return True
+
+    def remove(self, request_id: str) -> Optional[Dict[str, Any]]:
+        """Drop a request and its index entries, returning it if present."""
+        with self._lock:
+            return self._pop(request_id)
+
+    def prune(self) -> int:
+        """Evict requests idle for longer than the TTL; returns how many were evicted."""
+        with self._lock:
+            evicted = self._evict(time.monotonic(), make_room=False)
+        for request_info in evicted:
+            self._fail(request_info, RequestEvictedError("Pending request expired"))
+        return len(evicted)
+
+    def stats(self) -> Dict[str, int]:
+        """Return table size and eviction/orphan counters."""
+        with self._lock:
+            return {
+                'pending': len(self._requests),
+                'max_size': self.max_size,
+                'evicted': self.evicted,
+                'orphaned': self.orphaned,
+            }
+
+    def _evict(self, now: float, make_room: bool = True):
+        # Requests are kept in order of last activity, so the stalest come
+        # first and eviction stops at the first one that is still fresh
+        evicted = []
+        while self._requests:
+            request_id = next(iter(self._requests))
+            expired = now - self._requests[request_id]['touched'] > self.ttl
+            full = make_room and len(self._requests) >= self.max_size
+            if not (expired or full):
+                break
+            evicted.append(self._pop(request_id))
+        self.evicted += len(evicted)
+        return evicted
+
+    def _pop(self, request_id: str) -> Optional[Dict[str, Any]]:
+        request_info = self._requests.pop(request_id, None)
+        if request_info is None:
+            return None
+        if request_info['msg_id'] is not None:
+            self._by_msg_id.pop(request_info['msg_id'], None)
+        self._discard(self._by_context, request_info['contextId'], request_id)
+        self._discard(self._by_target, request_info['target'], request_id)
+        return request_info
+
+    @staticmethod
+    def _discard(index: Dict[str, Dict[str, None]], key: Optional[str], request_id: str):
+        request_ids = index.get(key)
+        if request_ids is None:
+            return
+        request_ids.pop(request_id, None)
+        if not request_ids:
+            del index[key]
+
+    def _fail(self, request_info: Dict[str, Any], error: Exception):
+        self._put(request_info, error)
+
+    def _put(self, request_info: Dict[str, Any], item: Any):
+        # asyncio queues may only be used from the loop that reads them
+        if self.thread_safe:
+            request_info['loop'].call_soon_threadsafe(request_info['replies'].put_nowait, item)
+        else:
+            request_info['replies'].put_nowait(item)
@@ -0,0 +1,168 @@
+"""Queued push-notification delivery for the A2A server."""
+
+import asyncio
+import logging
+import random
+from typing import Dict, List, Optional, Set
+from urllib.parse import urlsplit
+
+import httpx
+from a2a.server.tasks import InMemoryPushNotifier
+from a2a.types import Task
+
+logger = logging.getLogger(__name__)
+
+
+class BatchedPushNotifier(InMemoryPushNotifier):
+    """
+    Push notifier that delivers from a background worker pool.
+
+    ``InMemoryPushNotifier`` posts every task update inline, so a slow or
+    unreachable webhook holds up the request that produced the update. This
+    notifier only queues the update and returns:
+
+    - updates for a task that is still waiting are coalesced, so the webhook
+      receives the newest state once instead of every intermediate one
+    - a fixed number of workers deliver from a bounded queue; updates for new
+      tasks are dropped with a warning once it is full
+    - at most ``max_per_destination`` deliveries run at once per webhook host
+    - failed deliveries (connection errors, 429 and 5xx responses) are retried
+      with jittered exponential backoff
+
+    Updates for one task are never delivered concurrently or out of order.
+    Push configs are stored as in ``InMemoryPushNotifier``.
+    """
+
+    def __init__(self, httpx_client: httpx.AsyncClient, workers: int = 4, max_queue: int = 1000,
+                 max_per_destination: int = 4, max_retries: int = 3,
+                 retry_base_delay: float = 0.5, retry_max_delay: float = 10.0):
+        """
+        Args:
+            httpx_client: Client used to post notifications
+            workers: Number of concurrent delivery workers (default: 4)
+            max_queue: Maximum number of tasks waiting for delivery (default: 1000)
+            max_per_destination: Concurrent deliveries per webhook host (default: 4)
+            max_retries: Retries after a failed delivery (default: 3)
+            retry_base_delay: Backoff before the first retry in seconds (default: 0.5)
+            retry_max_delay: Upper bound for the backoff in seconds (default: 10)
+        """
+        super().__init__(httpx_client)
+        self.httpx_client = httpx_client
+        self.workers = workers
+        self.max_per_destination = max_per_destination
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.max_queue = max_queue
+        self._queue: Optional[asyncio.Queue] = None
+        self._latest: Dict[str, Task] = {}
+        self._delivering: Set[str] = set()
+        self._destinations: Dict[str, asyncio.Semaphore] = {}
+        self._workers: List[asyncio.Task] = []
+
+    async def send_notification(self, task: Task) -> None:
+        """Queue the newest state of ``task`` for delivery and return immediately."""
+        self._start_workers()
+        if task.id in self._latest:
+            self.coalesced += 1
+        elif task.id not in self._delivering:
+            try:
+                self._queue.put_nowait(task.id)
+            except asyncio.QueueFull:
+                self.dropped += 1
+                logger.warning(f"Push notification queue full, dropping update for task {task.id}")
+                return
+        # A task that is being delivered is picked up again by its worker
+        self._latest[task.id] = task
+
+    def stats(self) -> Dict[str, int]:
+        """Return queue depth and delivery counters."""
+        return {
+            'queued': self._queue.qsize() if self._queue else 0,
+            'delivering': len(self._delivering),
+            'sent': self.sent,
+            'failed': self.failed,
+            'retried': self.retried,
+            'coalesced': self.coalesced,
+            'dropped': self.dropped,
+        }
+
+    async def aclose(self, timeout: float = 5.0):
+        """Wait up to ``timeout`` seconds for queued notifications, then stop the workers."""
+        if self._workers:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Dropping {self._queue.qsize()} undelivered push notifications on shutdown")
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._latest.clear()
+        self._delivering.clear()
+
+    def _start_workers(self):
+        # The queue and workers belong to the loop of the first notification
+        if not self._workers:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._workers = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def _work(self):
+        while True:
+            task_id = await self._queue.get()
+            self._delivering.add(task_id)
+            try:
+                # Keep the task until no newer state arrived during delivery
+                while task_id in self._latest:
+                    await self._deliver(self._latest.pop(task_id))
+            except Exception as e:
+                logger.error(f"Push notification worker error for task {task_id}: {e}")
+            finally:
+                self._delivering.discard(task_id)
+                self._queue.task_done()
+
+    async def _deliver(self, task: Task):
+        push_info = await self.get_info(task.id)
+        if not push_info:
+            return
+        url = push_info.url
+        destination = urlsplit(url).netloc
+        semaphore = self._destinations.get(destination)
+        if semaphore is None:
+            semaphore = self._destinations[destination] = asyncio.Semaphore(self.max_per_destination)
+
+        payload = task.model_dump(mode='json', exclude_none=True)
+        for attempt in range(self.max_retries + 1):
+            error = None
+            async with semaphore:
+                try:
+                    response = await self.httpx_client.post(url, json=payload)
+                    if response.status_code == 429 or response.status_code >= 500:
+                        error = f"HTTP {response.status_code}"
+                    else:
+                        response.raise_for_status()
+                except httpx.HTTPStatusError as e:
+                    # Other 4xx responses will not succeed on retry
+                    self.failed += 1
+                    logger.error(f"Push notification for task {task.id} to {url} rejected: {e}")
+                    return
+                except httpx.HTTPError as e:
+                    error = str(e) or type(e).__name__
+            if error is None:
+                self.sent += 1
+                logger.debug(f"Push notification sent for task {task.id} to {url}")
+                return
+            if attempt < self.max_retries:
+                self.retried += 1
+                await asyncio.sleep(self._backoff(attempt))
+        self.failed += 1
+        logger.error(f"Push notification for task {task.id} to {url} failed after {self.max_retries + 1} attempts: {error}")
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter: spread retries from many tasks over the whole window
+        return random.uniform(0, min(self.retry_max_delay, self.retry_base_delay * 2 ** attempt))
@@ -0,0 +1,138 @@
+"""Opt-in cache of completed answers from target agents."""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# (target agent address, normalized query)
+CacheKey = Tuple[str, str]
+
+
+def normalize_query(query: str) -> str:
+    """Fold case and collapse whitespace, so trivially different phrasings share an entry."""
+    return " ".join(query.split()).casefold()
+
+
+class ResponseCache:
+    """
+    LRU cache of completed answers, keyed on target agent and normalized query.
+
+    Entries live for ``ttl`` seconds, or for the target's own TTL set with
+    ``set_ttl``; a TTL of 0 turns caching off for that target. At most
+    ``max_entries`` answers are kept, least recently used first out.
+
+    A query that is being answered is tracked as in flight from ``begin``
+    until ``finish``, so identical queries arriving meanwhile, even while
+    the first one still waits for an admission slot, wait for that answer
+    (``wait``) instead of asking the target again. Only completed answers
+    are stored; when the request in flight fails or needs input, the
+    waiters ask on their own.
+
+    The cache belongs to the event loop its executors run on.
+    """
+
+    def __init__(self, ttl: float = 60.0, max_entries: int = 1024,
+                 agent_ttls: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            ttl: Seconds an answer is served from the cache (default: 60)
+            max_entries: Maximum number of answers kept (default: 1024)
+            agent_ttls: TTL per target agent address, overriding ``ttl``
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.agent_ttls: Dict[str, float] = dict(agent_ttls or {})
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evicted = 0
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._in_flight: Dict[CacheKey, asyncio.Future] = {}
+
+    def set_ttl(self, target: str, ttl: float):
+        """Serve answers from ``target`` for ``ttl`` seconds; 0 never caches them."""
+        self.agent_ttls[target] = ttl
+
+    def ttl_for(self, target: str) -> float:
+        return self.agent_ttls.get(target, self.ttl)
+
+    def key(self, target: str, query: str) -> Optional[CacheKey]:
+        """Cache key for ``query`` to ``target``, or None if ``target`` is not cached."""
+        if self.ttl_for(target) <= 0:
+            return None
+        return target, normalize_query(query)
+
+    def get(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        """Return the cached answer for ``key`` unless it has expired."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._entries[key]
+        return None
+
+    def in_flight(self, key: CacheKey) -> Optional[asyncio.Future]:
+        """Future for the answer to ``key`` being fetched right now, if any."""
+        return self._in_flight.get(key)
+
+    async def wait(self, key: CacheKey, timeout: float) -> Optional[Dict[str, Any]]:
+        """
+        Wait up to ``timeout`` seconds for the answer in flight for ``key``.
+
+        Returns:
+            The answer, or None if there is none in flight or it was not cached
+        """
+        pending = self._in_flight.get(key)
+        if pending is None:
+            return None
+        self.coalesced += 1
+        try:
+            return await asyncio.wait_for(asyncio.shield(pending), timeout=max(0.0, timeout))
+        except asyncio.TimeoutError:
+            return None
+
+    def begin(self, key: CacheKey) -> Optional[asyncio.Future]:
+        """
+        Mark ``key`` as being fetched by the caller; counted as a miss.
+
+        Returns:
+            The future waiters get the answer from, done once ``finish`` is
+            called, or None if another request is already fetching ``key``
+        """
+        self.misses += 1
+        if key in self._in_flight:
+            return None
+        fetch = self._in_flight[key] = asyncio.get_running_loop().create_future()
+        return fetch
+
+    def finish(self, key: CacheKey, answer: Optional[Dict[str, Any]] = None):
+        """
+        End the fetch started with ``begin``; a completed ``answer`` is
+        stored and handed to waiters, without one they ask on their own.
+        """
+        if answer is not None:
+            self._entries[key] = (time.monotonic() + self.ttl_for(key[0]), answer)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evicted += 1
+        pending = self._in_flight.pop(key, None)
+        if pending is not None and not pending.done():
+            pending.set_result(answer)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache size, hits, misses (requests sent to the target), coalesced requests and evictions."""
+        return {
+            'entries': len(self._entries),
+            'in_flight': len(self._in_flight),
+            'hits': self.hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+            'evicted': self.evicted,
+        }
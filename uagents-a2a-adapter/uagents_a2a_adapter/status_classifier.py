@@ -0,0 +1,84 @@
+"""Decide the A2A task state for a target agent's final reply."""
+
+import json
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+COMPLETED = 'completed'
+INPUT_REQUIRED = 'input_required'
+ERROR = 'error'
+STATUSES = (COMPLETED, INPUT_REQUIRED, ERROR)
+
+# Fallback rules for targets that do not send a status, checked in order.
+# They only match clear requests for input, not every "what" or "how".
+DEFAULT_RULES: List[Tuple[str, str]] = [
+    (ERROR, r"^\s*(error\b|sorry, i encountered an error)"),
+    (INPUT_REQUIRED, r"\b(please|could you|can you)\s+(provide|specify|clarify|confirm|tell me)\b"),
+    (INPUT_REQUIRED, r"\b(need|require)s?\s+(more|additional)\s+(information|details)\b"),
+]
+
+
+class StatusClassifier:
+    """
+    Classifies a final reply as completed, input_required or error.
+
+    A target can state the outcome itself by sending ``{"status": ...}`` in
+    the reply's ``MetadataContent``; that always wins. Otherwise the reply
+    text is checked against an ordered list of compiled regex rules, and the
+    first rule that matches decides. A reply that matches no rule is
+    ``completed``.
+    """
+
+    def __init__(self, rules: Optional[Sequence[Tuple[str, str]]] = None, default: str = COMPLETED):
+        """
+        Args:
+            rules: ``(status, pattern)`` pairs checked in order, matched
+                case-insensitively (default: ``DEFAULT_RULES``)
+            default: Status when no rule matches (default: "completed")
+        """
+        self.default = self._check_status(default)
+        self.rules = [
+            (self._check_status(status), re.compile(pattern, re.IGNORECASE))
+            for status, pattern in (DEFAULT_RULES if rules is None else rules)
+        ]
+
+    @classmethod
+    def from_file(cls, path: str) -> "StatusClassifier":
+        """
+        Load rules from a JSON file.
+
+        The file holds a list of ``{"status": ..., "pattern": ...}`` objects,
+        or an object with such a ``rules`` list and an optional ``default``.
+        """
+        with open(path) as rules_file:
+            config = json.load(rules_file)
+        if isinstance(config, list):
+            config = {'rules': config}
+        return cls(
+            rules=[(rule['status'], rule['pattern']) for rule in config.get('rules', [])],
+            default=config.get('default', COMPLETED),
+        )
+
+    def classify(self, text: str, metadata: Optional[Dict[str, str]] = None) -> str:
+        """Return the status for a reply with ``text`` and reply ``metadata``."""
+        explicit = self.normalize((metadata or {}).get('status'))
+        if explicit is not None:
+            return explicit
+        for status, pattern in self.rules:
+            if pattern.search(text):
+                return status
+        return self.default
+
+    @staticmethod
+    def normalize(status: Optional[str]) -> Optional[str]:
+        """Map a status as sent by a target (e.g. "input-required") to a known one, or None."""
+        if not status:
+            return None
+        status = status.strip().lower().replace('-', '_')
+        return status if status in STATUSES else None
+
+    def _check_status(self, status: str) -> str:
+        normalized = self.normalize(status)
+        if normalized is None:
+            raise ValueError(f"Unknown status {status!r}; expected one of {', '.join(STATUSES)}")
+        return normalized
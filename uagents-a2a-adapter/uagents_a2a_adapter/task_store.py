@@ -0,0 +1,214 @@
+"""SQLite-backed A2A task store with a bounded in-memory hot set."""
+
+import asyncio
+import logging
+import sqlite3
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Set
+
+from a2a.server.tasks import TaskStore
+from a2a.types import Task, TaskState
+
+logger = logging.getLogger(__name__)
+
+# Tasks in these states never change again and can be pruned after the TTL
+TERMINAL_STATES = (TaskState.completed, TaskState.canceled, TaskState.failed, TaskState.rejected)
+
+
+class SQLiteTaskStore(TaskStore):
+    """
+    Task store that keeps tasks in SQLite and only the recent ones in memory.
+
+    ``InMemoryTaskStore`` keeps every task ever served and loses them all on
+    restart. This store writes tasks to a SQLite database in WAL mode and
+    keeps an LRU hot set of the most recently used tasks in memory, so RAM
+    use is bounded by ``hot_set_size`` however many tasks are stored. A
+    restart needs no warm-up: tasks are read from disk when first requested.
+
+    Saves are written in batches by a background flusher, once every
+    ``flush_interval`` seconds or as soon as ``batch_size`` tasks are
+    waiting. A crash can lose at most the last interval of updates. Tasks in
+    a terminal state are deleted once they have not changed for
+    ``completed_ttl`` seconds.
+
+    All database access runs on one dedicated thread, so the event loop
+    never blocks on disk I/O.
+    """
+
+    def __init__(self, path: str = "a2a_tasks.db", hot_set_size: int = 1000, batch_size: int = 100,
+                 flush_interval: float = 0.05, completed_ttl: float = 86400.0, prune_interval: float = 300.0):
+        """
+        Args:
+            path: SQLite database file (default: "a2a_tasks.db")
+            hot_set_size: Tasks kept in memory, least recently used out first (default: 1000)
+            batch_size: Pending saves that trigger an immediate flush (default: 100)
+            flush_interval: Seconds between background flushes (default: 0.05)
+            completed_ttl: Seconds a finished task is kept after its last update (default: 86400)
+            prune_interval: Seconds between pruning runs (default: 300)
+        """
+        self.path = path
+        self.hot_set_size = hot_set_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.completed_ttl = completed_ttl
+        self.prune_interval = prune_interval
+        self._hot: "OrderedDict[str, Task]" = OrderedDict()
+        self._dirty: Dict[str, Task] = {}
+        self._writing: Dict[str, Task] = {}
+        self._deleted: Set[str] = set()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="a2a-task-store")
+        self._db: Optional[sqlite3.Connection] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._last_prune = 0.0
+
+    async def save(self, task: Task):
+        """Save or update a task; it reaches disk with the next batch."""
+        self._start_flusher()
+        self._remember(task)
+        self._dirty[task.id] = task
+        self._deleted.discard(task.id)
+        if len(self._dirty) >= self.batch_size:
+            # Write the batch now so pending saves stay bounded under load
+            await self.flush()
+
+    async def get(self, task_id: str) -> Optional[Task]:
+        """Return the task from memory, or load it from disk."""
+        task = self._hot.get(task_id) or self._dirty.get(task_id) or self._writing.get(task_id)
+        if task is not None:
+            self._remember(task)
+            return task
+        if task_id in self._deleted:
+            return None
+        data = await self._run(self._load, task_id)
+        if data is None:
+            return None
+        task = Task.model_validate_json(data)
+        self._remember(task)
+        return task
+
+    async def delete(self, task_id: str):
+        """Delete a task from memory now and from disk with the next batch."""
+        self._start_flusher()
+        self._hot.pop(task_id, None)
+        self._dirty.pop(task_id, None)
+        self._writing.pop(task_id, None)
+        self._deleted.add(task_id)
+
+    async def flush(self):
+        """Write every pending save and delete to disk in one transaction."""
+        if self._flush_lock is None:
+            return
+        async with self._flush_lock:
+            if not self._dirty and not self._deleted:
+                return
+            # Tasks being written stay readable until they are on disk
+            self._writing, self._dirty = self._dirty, {}
+            deleted, self._deleted = self._deleted, set()
+            rows = [
+                (task.id, task.contextId, task.status.state.value, time.time(), task.model_dump_json(exclude_none=True))
+                for task in self._writing.values()
+            ]
+            try:
+                await self._run(self._write, rows, list(deleted))
+            except Exception:
+                # Keep the batch for the next flush unless it was superseded
+                for task_id, task in self._writing.items():
+                    if task_id not in self._deleted:
+                        self._dirty.setdefault(task_id, task)
+                self._deleted |= {task_id for task_id in deleted if task_id not in self._dirty}
+                raise
+            finally:
+                self._writing = {}
+
+    async def prune(self) -> int:
+        """Delete finished tasks older than the TTL; returns how many were deleted."""
+        cutoff = time.time() - self.completed_ttl
+        pruned = await self._run(self._delete_expired, cutoff)
+        if pruned:
+            logger.info(f"Pruned {pruned} finished tasks from {self.path}")
+        return pruned
+
+    def stats(self) -> Dict[str, int]:
+        """Return the hot set size and pending writes."""
+        return {
+            'hot': len(self._hot),
+            'hot_set_size': self.hot_set_size,
+            'pending_writes': len(self._dirty) + len(self._writing) + len(self._deleted),
+        }
+
+    async def aclose(self):
+        """Flush pending writes and close the database."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+        await self.flush()
+        if self._db is not None:
+            await self._run(self._db.close)
+            self._db = None
+        self._executor.shutdown(wait=False)
+
+    def _remember(self, task: Task):
+        self._hot[task.id] = task
+        self._hot.move_to_end(task.id)
+        while len(self._hot) > self.hot_set_size:
+            self._hot.popitem(last=False)
+
+    def _start_flusher(self):
+        # The flusher belongs to the loop of the first write
+        if self._flusher is None:
+            self._flush_lock = asyncio.Lock()
+            self._flusher = asyncio.create_task(self._flush_periodically())
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+                if time.monotonic() - self._last_prune >= self.prune_interval:
+                    self._last_prune = time.monotonic()
+                    await self.prune()
+            except Exception as e:
+                logger.error(f"Task store flush failed: {e}")
+
+    async def _run(self, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+
+    # The methods below run on the store's database thread
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._db is None:
+            self._db = sqlite3.connect(self.path)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute("PRAGMA busy_timeout=5000")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS tasks ("
+                "id TEXT PRIMARY KEY, context_id TEXT, state TEXT, updated REAL, data TEXT)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS tasks_state_updated ON tasks (state, updated)")
+            self._db.commit()
+        return self._db
+
+    def _load(self, task_id: str) -> Optional[str]:
+        row = self._connection().execute("SELECT data FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        return row[0] if row else None
+
+    def _write(self, rows: List[tuple], deleted: Iterable[str]):
+        db = self._connection()
+        with db:
+            db.executemany("INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?, ?)", rows)
+            db.executemany("DELETE FROM tasks WHERE id = ?", [(task_id,) for task_id in deleted])
+
+    def _delete_expired(self, cutoff: float) -> int:
+        db = self._connection()
+        states = [state.value for state in TERMINAL_STATES]
+        with db:
+            cursor = db.execute(
+                f"DELETE FROM tasks WHERE state IN ({', '.join('?' * len(states))}) AND updated < ?",
+                (*states, cutoff),
+            )
+        return cursor.rowcount